@@ -0,0 +1,101 @@
+"""Requester calls over pooled keep-alive connections, against new
+connections per call (as requests.request does).
+
+The calls are sent to an in-process HTTP/1.1 server, which counts the
+connections it accepted - on loopback, so over a network the saved
+handshakes are worth more.
+
+Usage: python benchmarks/bench_pool.py [calls]
+"""
+from __future__ import absolute_import, print_function
+
+import sys
+import json
+import threading
+from six.moves import BaseHTTPServer, socketserver
+
+from common import timer, GetCats, CatsDescriptorModel
+
+from swaggapi.api.builder.client.requester import Requester
+
+CALLS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+BODY = json.dumps({"cats": [{"id": 1, "name": "Garfield",
+                             "friends_ids": [1, 3]}]}).encode("utf-8")
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+
+    def setup(self):
+        Handler.connections += 1
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class UnpooledRequester(Requester):
+    """Sends every call through requests.request - a new connection."""
+    session = None
+
+
+def run(requester, threads):
+    data = CatsDescriptorModel({"cats_ids": [1, 2]})
+
+    def work(calls):
+        for _ in range(calls):
+            requester.request(GetCats, "post", data)
+
+    workers = [threading.Thread(target=work, args=(CALLS // threads,))
+               for _ in range(threads)]
+    started = timer()
+    for worker in workers:
+        worker.start()
+
+    for worker in workers:
+        worker.join()
+
+    return timer() - started
+
+
+def main():
+    server = Server(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    port = server.server_address[1]
+    for threads in (1, 8):
+        for name, requester_type in (("unpooled", UnpooledRequester),
+                                     ("pooled", Requester)):
+            Handler.connections = 0
+            with requester_type("127.0.0.1", port, "api",
+                                timeout=5) as requester:
+                seconds = run(requester, threads)
+
+            print("{:<8} threads={} {} calls: {:5.0f} req/s "
+                  "{:.3f}ms/call connections={}".format(
+                      name, threads, CALLS, CALLS / seconds,
+                      seconds / CALLS * 1000 * threads,
+                      Handler.connections))
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
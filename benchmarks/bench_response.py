@@ -0,0 +1,45 @@
+"""Per response overhead of binding a Response to its view method.
+
+The responses are created `DEPTH` frames deep, as under a real middleware
+stack. ``inspect.stack()`` - what binding a response used to cost - is
+measured at the same depth for reference.
+
+Usage: python benchmarks/bench_response.py [depth]
+"""
+from __future__ import absolute_import, print_function
+
+import sys
+import inspect
+
+from common import best_of, GetCats, Response, http_client
+
+DEPTH = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+NUMBER = 2000
+
+
+class View(GetCats):
+    def get(self, request):
+        return Response({"details": "no cats"}, http_client.BAD_REQUEST)
+
+    def head(self, request):
+        return self.respond({"details": "no cats"}, http_client.BAD_REQUEST)
+
+
+def deep(depth, function):
+    return deep(depth - 1, function) if depth else function()
+
+
+def main():
+    view = View()
+    view.current_method = "head"
+    cases = [("inspect.stack()", inspect.stack),
+             ("Response()", lambda: view.get(None)),
+             ("self.respond()", lambda: view.head(None))]
+    for name, function in cases:
+        seconds = best_of(lambda: deep(DEPTH, function), number=NUMBER)
+        print("{:<16} {:8.1f}us/response ({} frames deep)".format(
+            name, seconds * 1e6, DEPTH))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Full spec build of a large API, in each validation mode.
+
+The API has `OPERATIONS` generated operations (copies of the cats
+requests). The build is the document objects (where the types of the
+OpenAPI objects are checked) and their serialization.
+
+Usage: python benchmarks/bench_spec_build.py [operations]
+"""
+from __future__ import absolute_import, print_function
+
+import sys
+
+from common import best_of, GetCats, AddOwner
+
+from swaggapi.build import Swagger
+from swaggapi.api.openapi.models import Info, License, Tag
+from swaggapi.api.openapi.abstract_model import VALIDATE, DEFERRED, TRUSTED
+
+OPERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+
+INFO = Info(title="Cats", version="1.0.0", description="Cats",
+            license=License(name="MIT"))
+
+
+def make_requests(count):
+    requests = []
+    for index in range(count // 2):
+        for base in (GetCats, AddOwner):
+            requests.append(type("{}{}".format(base.__name__, index),
+                                 (base,),
+                                 {"URI": "{}{}".format(base.URI, index)}))
+
+    return requests
+
+
+def build(requests, validation):
+    swagger = Swagger(INFO, requests=requests, mount_url="api",
+                      tags=[Tag(name="Cats"), Tag(name="Owners")],
+                      validation=validation)
+    return swagger.get_spec()
+
+
+def main():
+    requests = make_requests(OPERATIONS)
+    for validation in (VALIDATE, DEFERRED, TRUSTED):
+        seconds = best_of(lambda: build(requests, validation), repeat=3)
+        print("{:<9} {} operations: {:.2f}s".format(validation,
+                                                   len(requests), seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Shared setup of the benchmarks - a minimal django configuration and an
+API of cats to measure.
+
+Run the benchmarks from the repository root, e.g.
+``python benchmarks/bench_response.py`` - compare revisions by running them
+on each one.
+"""
+from __future__ import absolute_import
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "src"))
+
+import django
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure(DEBUG=False, SECRET_KEY="benchmarks",
+                       ALLOWED_HOSTS=["*"], MIDDLEWARE=[])
+    django.setup()
+
+from six.moves import http_client
+
+from swaggapi.api.builder.common.model import AbstractAPIModel
+from swaggapi.api.builder.common.response import AbstractResponse
+from swaggapi.api.builder.common.fields import (NumberField, StringField,
+                                                ArrayField, ModelField,
+                                                BoolField)
+from swaggapi.api.builder.server.request import DjangoRequestView
+from swaggapi.api.builder.server.response import Response
+
+
+timer = timeit.default_timer
+
+
+def best_of(function, repeat=5, number=1):
+    """Get the best time of a function in seconds, per call."""
+    return min(timeit.repeat(function, repeat=repeat, number=number)) / number
+
+
+class CatModel(AbstractAPIModel):
+    """A cat."""
+    TITLE = "Cat"
+    PROPERTIES = [NumberField(name="id", required=True),
+                  StringField(name="name", required=True),
+                  BoolField(name="lazy"),
+                  ArrayField(name="friends_ids",
+                             items_type=NumberField(name="friend_id"),
+                             required=True)]
+    EXAMPLE = {"id": 0, "name": "Garfield", "friends_ids": [1, 3]}
+
+
+class OwnerModel(AbstractAPIModel):
+    """An owner of cats."""
+    PROPERTIES = [StringField(name="name", required=True),
+                  ModelField(name="cat", model=CatModel, required=True),
+                  ArrayField(name="cats", items_type=CatModel,
+                             required=True)]
+
+
+class CatsDescriptorModel(AbstractAPIModel):
+    PROPERTIES = [ArrayField(name="cats_ids",
+                             items_type=NumberField(name="cat_id"),
+                             required=True),
+                  StringField(name="filter", location="query"),
+                  NumberField(name="limit", location="query")]
+
+
+class CatsModel(AbstractResponse):
+    """Cats list."""
+    PROPERTIES = [ArrayField(name="cats", items_type=CatModel,
+                             required=True)]
+    EXAMPLES = {"default": {"cats": [CatModel.EXAMPLE]}}
+
+
+class NoCatsFoundModel(AbstractResponse):
+    """No cats."""
+    PROPERTIES = [StringField(name="details", required=True)]
+
+
+class GetCats(DjangoRequestView):
+    """Get cats by their ids."""
+    URI = "get_cats"
+    DEFAULT_MODEL = CatsDescriptorModel
+    DEFAULT_RESPONSES = {http_client.OK: CatsModel,
+                         http_client.BAD_REQUEST: NoCatsFoundModel}
+    TAGS = {"post": ["Cats"]}
+
+    def post(self, request, *args, **kwargs):
+        return Response({"cats": [dict(CatModel.EXAMPLE, id=cat_id)
+                                  for cat_id in request.model.cats_ids]},
+                        http_client.OK)
+
+
+class AddOwner(DjangoRequestView):
+    """Add an owner."""
+    URI = "owners"
+    PARAMS_MODELS = dict(DjangoRequestView.PARAMS_MODELS, post=OwnerModel)
+    RESPONSES_MODELS = dict(DjangoRequestView.RESPONSES_MODELS,
+                            post={http_client.OK: NoCatsFoundModel})
+    TAGS = {"post": ["Owners"]}
+
+    def post(self, request, *args, **kwargs):
+        return self.respond({"details": request.model.cat.name},
+                            http_client.OK)
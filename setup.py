@@ -9,8 +9,8 @@ __version__ = "0.6.7"
 requirements = [
     'django>=1.7',
     'requests',
-    'attrdict',
-    'six'
+    'six>=1.13',
+    'futures; python_version < "3"'
 ]
 
 
@@ -29,6 +29,9 @@ setup(
     author_email="elran777@gmail.com",
     url="https://github.com/IamShobe/swaggapi",
     install_requires=requirements,
+    extras_require={
+        "async": ['aiohttp>=3.6; python_version >= "3.7"'],
+    },
     python_requires=">=2.7,!=3.0.*,!=3.1.*,!=3.2.*,!=3.3.*,!=3.4.*",
     packages=find_packages("src"),
     package_dir={"": "src"},
@@ -0,0 +1,157 @@
+"""asyncio client of the requests of an API (python 3.7+).
+
+Requires aiohttp - ``pip install swaggapi[async]``.
+"""
+from __future__ import absolute_import
+
+import os
+import asyncio
+import weakref
+from six.moves.urllib.parse import urlsplit
+
+from swaggapi.api.codec import dumps, loads
+from swaggapi.api.builder.utils import get_dict_leafs
+from swaggapi.api.builder.common.model import AbstractAPIModel
+from swaggapi.api.builder.client.requester import build_response
+
+
+def query_items(params):
+    """Get the query items of params, encoded as requests does.
+
+    None values are dropped, every item of a list becomes an item.
+    """
+    items = []
+    for key, value in params.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for item in values:
+            if item is not None:
+                items.append((key, item if isinstance(item, str) else
+                              str(item)))
+
+    return items
+
+
+class AsyncRequester(object):
+    """asyncio client of the requests of an API, over aiohttp.
+
+    The requests are sent over a pool of keep-alive connections. The
+    concurrent requests to a host are bounded by a semaphore - the requests
+    waiting for it aren't timed yet, so a burst of requests doesn't time
+    out while waiting for connections.
+
+    Example:
+        async with AsyncRequester(host, port, "api") as requester:
+            responses = await asyncio.gather(*[
+                requester.request(GetCat, "get", CatModel({"id": id}))
+                for id in ids])
+
+    Attributes:
+        LIMIT (number): the number of connections kept, 0 for no limit.
+        LIMIT_PER_HOST (number): the number of concurrent requests (and
+            connections) per host.
+        TIMEOUT (number / tuple): the timeout of a request in seconds, or a
+            (connect, read) timeouts tuple, None to wait forever.
+    """
+    LIMIT = 100
+    LIMIT_PER_HOST = 10
+    TIMEOUT = None
+
+    def __init__(self, host, port, base_url, logger=None, limit=None,
+                 limit_per_host=None, timeout=None):
+        import aiohttp
+        self.aiohttp = aiohttp
+
+        self.base_url = os.path.join("http://{}:{}/".format(host, port),
+                                     base_url)
+        self.logger = logger
+        self.limit = limit if limit is not None else self.LIMIT
+        self.limit_per_host = limit_per_host or self.LIMIT_PER_HOST
+        timeout = timeout if timeout is not None else self.TIMEOUT
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            self.timeout = aiohttp.ClientTimeout(sock_connect=connect,
+                                                 sock_read=read)
+
+        else:
+            self.timeout = aiohttp.ClientTimeout(total=timeout)
+
+        self._session = None
+        # event loop -> host -> semaphore, a semaphore is bound to its loop
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    @property
+    def session(self):
+        """The aiohttp session, created in the running loop on first use."""
+        if self._session is None or self._session.closed:
+            connector = self.aiohttp.TCPConnector(
+                limit=self.limit, limit_per_host=self.limit_per_host)
+            self._session = self.aiohttp.ClientSession(
+                connector=connector, timeout=self.timeout)
+
+        return self._session
+
+    def semaphore(self, host):
+        """Get the semaphore bounding the concurrent requests to a host, in
+        the running loop.
+        """
+        semaphores = self._semaphores.setdefault(asyncio.get_running_loop(),
+                                                 {})
+        semaphore = semaphores.get(host)
+        if semaphore is None:
+            semaphore = semaphores[host] = \
+                asyncio.Semaphore(self.limit_per_host)
+
+        return semaphore
+
+    async def close(self):
+        """Close the pooled connections."""
+        self._semaphores.clear()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def make_request(self, request_type, method, data=None):
+        url = os.path.join(self.base_url, request_type.URI)
+        body = params = headers = None
+        if data is not None:
+            body = dumps(data.body)
+            params = query_items(get_dict_leafs(data.params))
+            headers = {"Content-Type": "application/json"}
+
+        if self.logger:
+            self.logger.debug("request: %s - %s - %s - %s", url, method,
+                              body, params)
+
+        async with self.semaphore(urlsplit(url).netloc):
+            # released when cancelled - e.g. by a timeout of the caller
+            async with self.session.request(method, url, data=body,
+                                            params=params,
+                                            headers=headers) as response:
+                content = await response.read()
+
+        if self.logger:
+            self.logger.debug("response: %s(%s) - %s", response.reason,
+                              response.status, content)
+
+        try:
+            content = loads(content) if content else {}
+
+        except Exception:
+            raise RuntimeError("Got invalid response from server - {}".format(
+                response.status))
+
+        return response, content
+
+    async def request(self, request_type, method, data=None):
+        if data is not None and not isinstance(data, AbstractAPIModel):
+            raise ValueError("data must be an instance of AbstractAPIModel!")
+
+        response, content = await self.make_request(request_type, method,
+                                                    data)
+        return build_response(request_type, method, response.status, content)
@@ -0,0 +1,306 @@
+"""Client side cache of responses, see :class:`ResponseCache`."""
+from __future__ import absolute_import
+
+import os
+import io
+import re
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+from swaggapi.api.codec import dumps, loads
+
+
+MAX_AGE = re.compile(r"max-age\s*=\s*\"?(\d+)")
+
+# os.rename doesn't replace an existing file on windows (python 3.3+)
+replace = getattr(os, "replace", os.rename)
+
+
+def request_key(url, method, params=None, body=None):
+    """Get the key of a request - its url, method, params and body.
+
+    The params and body are hashed regardless of their keys order.
+    """
+    encoded = json.dumps([url, method.lower(), params, body], sort_keys=True,
+                         separators=(",", ":"), default=repr)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+class CacheEntry(object):
+    """A cached response.
+
+    Attributes:
+        status (number): the status code of the response.
+        content (object): the decoded content of the response.
+        etag (str): the entity tag of the response, None if it has none.
+        expires (number): the time (as :func:`time.time`) the entry is
+            fresh until.
+        response (AbstractAPIModel): the response model, None until built.
+    """
+    __slots__ = ("status", "content", "etag", "expires", "response")
+
+    def __init__(self, status, content, etag, expires, response=None):
+        self.status = status
+        self.content = content
+        self.etag = etag
+        self.expires = expires
+        self.response = response
+
+    def is_fresh(self, now=None):
+        return (time.time() if now is None else now) < self.expires
+
+    def encode(self):
+        return dumps({"status": self.status, "content": self.content,
+                      "etag": self.etag, "expires": self.expires})
+
+    @classmethod
+    def decode(cls, data):
+        fields = loads(data)
+        return cls(fields["status"], fields["content"], fields["etag"],
+                   fields["expires"])
+
+
+class ResponseCache(object):
+    """Cache of the responses of idempotent requests.
+
+    The entries are kept in memory, up to `max_entries` - the least recently
+    used are dropped first - and optionally in a directory, shared by
+    processes and kept across restarts. The directory is bounded the same
+    way: when an entry written makes it exceed `max_entries` files (as
+    counted by the process), the expired entries are dropped first, then
+    the least recently used (by the files' modification time) - down to
+    `PRUNED` of `max_entries`, so it's listed once in many writes.
+
+    An entry is fresh for the response's ``Cache-Control: max-age``, at most
+    `ttl` seconds (`ttl` when it has no max-age). A stale entry with an
+    ``ETag`` is revalidated with ``If-None-Match`` - a ``304 Not Modified``
+    response refreshes it. Responses with ``no-store`` aren't cached,
+    responses with ``no-cache`` are revalidated every time.
+
+    Attributes:
+        METHODS (tuple): the methods whose responses are cached.
+        STATUSES (tuple): the status codes of the cached responses.
+        PRUNED (number): the part of `max_entries` the directory is pruned
+            down to.
+    """
+    METHODS = ("get", "head")
+    STATUSES = (200,)
+    PRUNED = 0.9
+
+    def __init__(self, max_entries=1024, ttl=60, directory=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = directory
+        if directory is not None and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._files = None  # the entries in the directory, roughly
+
+    def get(self, key):
+        """Get the entry of a request key, fresh or not - None if missing.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                # most recently used last
+                del self._entries[key]
+                self._entries[key] = entry
+                return entry
+
+        if self.directory is not None:
+            entry = self._load(key)
+            if entry is not None:
+                self._touch(key)
+                self._add(key, entry)
+
+        return entry
+
+    def store(self, key, status, content, headers, response=None):
+        """Cache a response, if its status and headers allow.
+
+        Args:
+            key (str): the request key, see :func:`request_key`.
+            status (number): the status code of the response.
+            content (object): the decoded content of the response.
+            headers (dict): the headers of the response.
+            response (AbstractAPIModel): the response model.
+
+        Returns:
+            CacheEntry. the new entry, None if the response isn't cached.
+        """
+        cache_control = headers.get("Cache-Control", "").lower()
+        if status not in self.STATUSES or "no-store" in cache_control or \
+                headers.get("Vary", "").strip() == "*":
+            self.remove(key)
+            return None
+
+        entry = CacheEntry(status, content, headers.get("ETag"),
+                           self.expires(cache_control), response)
+        if entry.etag is None and not entry.is_fresh():
+            self.remove(key)
+            return None
+
+        self._add(key, entry)
+        if self.directory is not None and self._save(key, entry):
+            self._added_file()
+
+        return entry
+
+    def revalidated(self, key, entry, headers):
+        """Refresh an entry revalidated by a `304 Not Modified` response."""
+        entry.expires = self.expires(headers.get("Cache-Control",
+                                                 "").lower())
+        entry.etag = headers.get("ETag", entry.etag)
+        if self.directory is not None:
+            self._save(key, entry)
+
+    def expires(self, cache_control):
+        """Get the expiry time of a response by its Cache-Control header."""
+        if "no-cache" in cache_control:
+            return 0
+
+        ttl = self.ttl
+        max_age = MAX_AGE.search(cache_control)
+        if max_age is not None:
+            ttl = min(ttl, int(max_age.group(1)))
+
+        return time.time() + ttl
+
+    def remove(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+        if self.directory is not None:
+            try:
+                os.remove(self._path(key))
+
+            except OSError:
+                pass
+
+            else:
+                if self._files is not None:
+                    self._files -= 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, name))
+
+            self._files = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _add(self, key, entry):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def _load(self, key):
+        try:
+            with io.open(self._path(key), "rb") as entry_file:
+                entry = CacheEntry.decode(entry_file.read())
+
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if entry.etag is None and not entry.is_fresh():
+            self.remove(key)
+            return None
+
+        return entry
+
+    def _save(self, key, entry):
+        """Write an entry, returns whether its file is new."""
+        # written aside and renamed - readers never see a partial entry
+        descriptor, path = tempfile.mkstemp(dir=self.directory,
+                                            suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as entry_file:
+            entry_file.write(entry.encode())
+
+        entry_path = self._path(key)
+        new = not os.path.exists(entry_path)
+        replace(path, entry_path)
+        return new
+
+    def _added_file(self):
+        if self._files is None:
+            self._files = sum(1 for name in os.listdir(self.directory)
+                              if name.endswith(".json"))
+
+        else:
+            self._files += 1
+
+        if self._files > self.max_entries:
+            self._prune()
+
+    def _touch(self, key):
+        try:
+            os.utime(self._path(key), None)
+
+        except OSError:
+            pass
+
+    def _prune(self):
+        """Prune the directory down to `PRUNED` of `max_entries` entries."""
+        paths = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                path = os.path.join(self.directory, name)
+                try:
+                    paths.append((os.path.getmtime(path), path))
+
+                except OSError:  # removed by another process
+                    pass
+
+        self._files = len(paths)
+        if len(paths) <= self.max_entries:
+            return
+
+        paths.sort()
+        # the entries unused for `ttl` are the ones likely expired
+        stale_until = time.time() - self.ttl
+        expired = set()
+        for modified, path in paths:
+            if modified >= stale_until:
+                break
+
+            try:
+                with io.open(path, "rb") as entry_file:
+                    entry = CacheEntry.decode(entry_file.read())
+
+            except (IOError, OSError, ValueError, KeyError, TypeError):
+                expired.add(path)
+                continue
+
+            if entry.etag is None and not entry.is_fresh():
+                expired.add(path)
+
+        excess = len(paths) - int(self.max_entries * self.PRUNED)
+        removed = [path for _, path in paths if path in expired]
+        removed += [path for _, path in paths
+                    if path not in expired][:max(excess - len(removed), 0)]
+        for path in removed:
+            try:
+                os.remove(path)
+
+            except OSError:
+                pass
+
+            else:
+                self._files -= 1
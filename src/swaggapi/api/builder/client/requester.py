@@ -1,32 +1,215 @@
 from __future__ import absolute_import
 
 import os
-import json
+import weakref
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import six.moves.urllib.request, six.moves.urllib.parse, six.moves.urllib.error
 
+import requests
+from requests.structures import CaseInsensitiveDict
+from six.moves.http_client import NOT_MODIFIED
 from django.test import Client
+from requests.adapters import HTTPAdapter
+from swaggapi.api.codec import dumps, loads
 from swaggapi.api.builder.utils import get_dict_leafs
+from swaggapi.api.builder.client.cache import request_key
+from swaggapi.api.builder.client.single_flight import SingleFlight
 from swaggapi.api.builder.common.model import AbstractAPIModel
 
 
+class RequestResult(object):
+    """The result of a call of :meth:`Requester.request_many`.
+
+    Attributes:
+        index (number): the position of the call.
+        response (AbstractAPIModel): the response model, None if failed.
+        error (Exception): the error of the call, None if succeeded.
+    """
+    __slots__ = ("index", "request_type", "method", "data", "response",
+                 "error")
+
+    def __init__(self, index, request_type, method, data=None):
+        self.index = index
+        self.request_type = request_type
+        self.method = method
+        self.data = data
+        self.response = None
+        self.error = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def result(self):
+        """Get the response model, or raise the error of the call."""
+        if self.error is not None:
+            raise self.error
+
+        return self.response
+
+    def __repr__(self):
+        return "<RequestResult {} {} {}>".format(
+            self.index, self.method,
+            self.error if self.error is not None else self.response)
+
+
+def response_headers(response):
+    """Get the headers of a response - of requests or of django (whose
+    responses have no `headers` before django 3.2).
+    """
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        headers = CaseInsensitiveDict(response.items())
+
+    return headers
+
+
+def build_response(request_type, method, response_code, content):
+    """Create the response model of a request's response.
+
+    Args:
+        request_type (type): the request class.
+        method (str): the request method.
+        response_code (number): the status code of the response.
+        content (object): the decoded content of the response.
+    """
+    responses_models = request_type.get_responses_models(method)
+    response = responses_models[response_code](content)
+    response.code = response_code
+    return response
+
+
 class Requester(object):
-    def __init__(self, host, port, base_url, logger=None):
+    """Client of the requests of an API.
+
+    The requests are sent over a pool of keep-alive connections, shared by
+    the threads using the requester (each thread has its own session -
+    cookies aren't shared).
+
+    Attributes:
+        POOL_CONNECTIONS (number): the number of hosts to keep connections
+            to.
+        POOL_MAXSIZE (number): the number of connections kept per host.
+        POOL_BLOCK (bool): whether to wait for a free connection when all
+            the connections to a host are in use, instead of opening one
+            which isn't kept.
+        MAX_RETRIES (number): retries of failed connections.
+        TIMEOUT (number / tuple): the timeout in seconds, or a (connect,
+            read) timeouts tuple, None to wait forever.
+        MAX_WORKERS (number): the number of threads sending the requests of
+            :meth:`request_many`, the connections kept per host when None.
+        COALESCE (bool): whether identical concurrent requests of idempotent
+            methods share one round trip and response model, see
+            :class:`swaggapi.api.builder.client.single_flight.SingleFlight`.
+
+    Args:
+        cache (ResponseCache): cache of the responses of idempotent
+            requests, see :mod:`swaggapi.api.builder.client.cache`. The
+            responses aren't cached when None.
+    """
+    POOL_CONNECTIONS = 10
+    POOL_MAXSIZE = 10
+    POOL_BLOCK = False
+    MAX_RETRIES = 0
+    TIMEOUT = None
+    MAX_WORKERS = None
+    COALESCE = False
+
+    def __init__(self, host, port, base_url, logger=None,
+                 pool_connections=None, pool_maxsize=None, pool_block=None,
+                 max_retries=None, timeout=None, max_workers=None,
+                 cache=None, coalesce=None):
         self.base_url = os.path.join("http://{}:{}/".format(host, port),
                                      base_url)
         self.logger = logger
+        self.cache = cache
+        coalesce = coalesce if coalesce is not None else self.COALESCE
+        self.single_flight = SingleFlight() if coalesce else None
+        self.timeout = timeout if timeout is not None else self.TIMEOUT
+        pool_maxsize = pool_maxsize or self.POOL_MAXSIZE
+        self.max_workers = max_workers or self.MAX_WORKERS or pool_maxsize
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections or self.POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block if pool_block is not None else
+            self.POOL_BLOCK,
+            max_retries=max_retries if max_retries is not None else
+            self.MAX_RETRIES)
+        self._local = threading.local()
+        # owned by the threads - dropped with them
+        self._sessions = weakref.WeakSet()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The session of the current thread, over the shared pool."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self.adapter)
+            session.mount("https://", self.adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.add(session)
+
+        return session
+
+    @property
+    def executor(self):
+        """The thread pool sending the requests of :meth:`request_many`."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="swaggapi-requester")
+
+        return self._executor
+
+    def close(self):
+        """Close the pooled connections, and the threads of
+        :meth:`request_many`.
+        """
+        with self._lock:
+            sessions = list(self._sessions)
+            self._sessions = weakref.WeakSet()
+            executor, self._executor = self._executor, None
+            self._local = threading.local()
+
+        if executor is not None:
+            executor.shutdown()
+
+        for session in sessions:
+            session.close()
 
-    def make_request(self, request_type, method, data=None):
+        self.adapter.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def make_request(self, request_type, method, data=None, headers=None):
         if data is None:
-            response = request_type.execute(self.base_url, method,
-                                            logger=self.logger)
+            response = request_type.execute(self.base_url, method, None,
+                                            logger=self.logger,
+                                            session=self.session,
+                                            timeout=self.timeout,
+                                            headers=headers)
 
         else:
             response = request_type.execute(self.base_url, method,
                                             data.body,
                                             get_dict_leafs(data.params),
-                                            logger=self.logger)
+                                            logger=self.logger,
+                                            session=self.session,
+                                            timeout=self.timeout,
+                                            headers=headers)
         try:
-            content = response.json() if response.content else {}
+            content = loads(response.content) if response.content else {}
 
         except Exception:
             with open('error.html', "w") as f:
@@ -41,18 +224,100 @@ class Requester(object):
         if data is not None and not isinstance(data, AbstractAPIModel):
             raise ValueError("data must be an instance of AbstractAPIModel!")
 
+        if self.single_flight is not None and \
+                method.lower() in self.single_flight.METHODS:
+            return self.single_flight.do(
+                self._request_key(request_type, method, data),
+                self._request, request_type, method, data)
+
+        return self._request(request_type, method, data)
+
+    def _request(self, request_type, method, data=None):
+        if self.cache is not None and \
+                method.lower() in self.cache.METHODS:
+            return self.cached_request(request_type, method, data)
+
         response, content = \
             self.make_request(request_type, method, data)
 
-        response_code = response.status_code
-        responses_models = request_type.RESPONSES_MODELS[method]
-        if responses_models is None or \
-                not response_code in responses_models:
-            responses_models = request_type.DEFAULT_RESPONSES
+        return build_response(request_type, method, response.status_code,
+                              content)
+
+    def _request_key(self, request_type, method, data=None):
+        url = os.path.join(self.base_url, request_type.URI)
+        if data is None:
+            return request_key(url, method)
+
+        return request_key(url, method, get_dict_leafs(data.params),
+                           data.body)
+
+    def cached_request(self, request_type, method, data=None):
+        """Get the response model of a request from the cache.
+
+        The request is sent when it's not cached, or to revalidate a stale
+        response.
+        """
+        cache = self.cache
+        key = self._request_key(request_type, method, data)
+        entry = cache.get(key)
+        if entry is not None and entry.is_fresh():
+            if entry.response is None:
+                entry.response = build_response(request_type, method,
+                                                entry.status, entry.content)
+
+            return entry.response
 
-        response = responses_models[response_code](content)
-        response.code = response_code
-        return response
+        headers = None
+        if entry is not None and entry.etag is not None:
+            headers = {"If-None-Match": entry.etag}
+
+        response, content = self.make_request(request_type, method, data,
+                                              headers)
+        if response.status_code == NOT_MODIFIED and headers is not None:
+            cache.revalidated(key, entry, response_headers(response))
+            if entry.response is None:
+                entry.response = build_response(request_type, method,
+                                                entry.status, entry.content)
+
+            return entry.response
+
+        model = build_response(request_type, method, response.status_code,
+                               content)
+        cache.store(key, response.status_code, content,
+                    response_headers(response), model)
+        return model
+
+    def request_many(self, calls, ordered=True):
+        """Send requests concurrently, by the threads of :attr:`executor`.
+
+        All the requests are sent, a failed one doesn't stop the others.
+
+        Args:
+            calls (iterable): (request_type, method, data) of the requests,
+                data may be omitted.
+            ordered (bool): whether to yield the results in the calls order,
+                or as the requests complete.
+
+        Returns:
+            iterator. the :class:`RequestResult` of every call.
+        """
+        futures = [self.executor.submit(self._send,
+                                        RequestResult(index, *call))
+                   for index, call in enumerate(calls)]
+        if not ordered:
+            futures = as_completed(futures)
+
+        return (future.result() for future in futures)
+
+    def _send(self, result):
+        try:
+            result.response = self.request(result.request_type,
+                                           result.method, result.data)
+
+        except Exception as e:
+            result.error = e
+
+        return result
 
 
 # django client tester
@@ -61,25 +326,28 @@ class TestRequester(Requester):
         super(TestRequester, self).__init__(host, port, base_url, logger)
         self.client = Client()
 
-    def make_request(self, request_type, method, data=None):
+    def make_request(self, request_type, method, data=None, headers=None):
         params = ""
         if data and data.params:
             params = six.moves.urllib.parse.urlencode(
                 {key: str(value) for key, value in get_dict_leafs(
                     data.params).items()})
 
+        # the test client takes the headers as the WSGI environ
+        environ = {"HTTP_" + name.upper().replace("-", "_"): value
+                   for name, value in (headers or {}).items()}
         response = self.client.generic(
             method,
             "{}?{}".format(os.path.join(self.base_url, request_type.URI),
                            params),
-            data=json.dumps(data.body) if data else None,
-            content_type="application/json")
-
-        response_content = response.content.decode("utf-8")
+            data=dumps(data.body) if data else None,
+            content_type="application/json",
+            **environ)
 
         try:
-            return response, json.loads(response_content)
+            return response, loads(response.content)
 
         except:
+            response_content = response.content.decode("utf-8")
             return (response,
                     response_content if response_content != "" else {})
@@ -0,0 +1,75 @@
+"""Coalescing of identical in-flight calls, see :class:`SingleFlight`."""
+from __future__ import absolute_import
+
+import threading
+
+
+class _Call(object):
+    """An in-flight call, waited for by the identical calls."""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Coalesces identical concurrent calls into one.
+
+    The first call of a key runs, the calls of the key made while it runs
+    wait for it and get its result (the same object) or error - instead of
+    running again. A call made after it's done runs anew.
+
+    Attributes:
+        METHODS (tuple): the methods whose requests are coalesced - the
+            idempotent ones, for which one request is as good as many.
+    """
+    METHODS = ("get", "head")
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function, *args, **kwargs):
+        """Call a function, unless a call of the key is already in flight.
+
+        Args:
+            key (str): the key of identical calls, e.g. a request key - see
+                :func:`swaggapi.api.builder.client.cache.request_key`.
+            function (callable): the call.
+
+        Returns:
+            object. the result of the call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+
+            return call.result
+
+        try:
+            call.result = function(*args, **kwargs)
+
+        except BaseException as e:  # the waiters mustn't get a None result
+            call.error = e
+            raise
+
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            call.done.set()
+
+        return call.result
+
+    def __len__(self):
+        """The number of calls in flight."""
+        return len(self._calls)
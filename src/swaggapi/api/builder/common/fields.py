@@ -50,6 +50,10 @@ class Field(object):
     def ref_name(self):
         return self.name
 
+    def component_source(self, type):
+        """Get the object the component of the given type is built from."""
+        return self
+
     def examples(self, schema_bank, index):
         return Example(value=self.example)
 
@@ -154,5 +158,11 @@ class ModelField(Field):
     def ref_name(self):
         return self.model.ref_name()
 
+    def component_source(self, type):
+        if type == "schemas":
+            return self.model
+
+        return self
+
     def schemas(self, schema_bank, index):
         return self.model.schemas(schema_bank, index)
@@ -1,9 +1,11 @@
 from __future__ import absolute_import
 
-from attrdict import AttrDict
 from swaggapi.api.openapi.models import Example, Schema
-from swaggapi.api.builder.utils import get_schema, isfit
+from swaggapi.api.builder.utils import (get_schema,
+                                       compile_validator,
+                                       compile_shallow_validator)
 import six
+from six.moves.collections_abc import Mapping, Sequence
 
 
 NAME2TYPE = {
@@ -19,66 +21,238 @@ NAME2TYPE = {
 }
 
 
+def view(value):
+    """Wrap a parsed json value with a lazy read only view (no copy)."""
+    if isinstance(value, dict):
+        return AttrView(value)
+
+    if isinstance(value, list):
+        return ListView(value)
+
+    return value
+
+
+def unwrap(value):
+    """Get the parsed json value behind a view, other values as they are."""
+    if isinstance(value, AttrView):
+        return value._obj
+
+    if isinstance(value, ListView):
+        return value._items
+
+    return value
+
+
+class AttrDict(dict):
+    """dict with attribute access to its items (nested values as views)."""
+    __slots__ = ()
+
+    def __getattr__(self, item):
+        if item.startswith("_"):
+            raise AttributeError(item)
+
+        try:
+            return view(self[item])
+
+        except KeyError:
+            raise AttributeError(item)
+
+
+class AttrView(Mapping):
+    """Attribute access view over a dict, nested values are wrapped on read."""
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj):
+        self._obj = obj
+
+    def __getitem__(self, key):
+        return view(self._obj[key])
+
+    def __getattr__(self, item):
+        # private and special names (e.g. copy's) aren't items
+        if item.startswith("_"):
+            raise AttributeError(item)
+
+        try:
+            return view(self._obj[item])
+
+        except KeyError:
+            raise AttributeError(item)
+
+    def __contains__(self, key):
+        return key in self._obj
+
+    def __iter__(self):
+        return iter(self._obj)
+
+    def __len__(self):
+        return len(self._obj)
+
+    def __repr__(self):
+        return "AttrView({!r})".format(self._obj)
+
+
+class ListView(Sequence):
+    """Read only view over a list, nested values are wrapped on read."""
+    __slots__ = ("_items",)
+
+    def __init__(self, items):
+        self._items = items
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ListView(self._items[index])
+
+        return view(self._items[index])
+
+    def __len__(self):
+        return len(self._items)
+
+    def __eq__(self, other):
+        if isinstance(other, (ListView, list, tuple)):
+            return len(self) == len(other) and \
+                   all(a == b for a, b in zip(self, other))
+
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "ListView({!r})".format(self._items)
+
+
+class APIModelMetaClass(type):
+    """Freeze the fields tables of every model class on its creation.
+
+    The library's base models are slotted - a subclass declaring empty
+    `__slots__` keeps its instances slotted, otherwise they get a `__dict__`
+    as usual.
+    """
+    def __init__(cls, name, bases, attrs):
+        super(APIModelMetaClass, cls).__init__(name, bases, attrs)
+        cls.reindex()
+
+
+@six.add_metaclass(APIModelMetaClass)
 class AbstractAPIModel(object):
     TITLE = None
     PROPERTIES = []
     EXAMPLE = None
     COMPONENT = "schemas"
 
+    __slots__ = ("obj", "code", "_params", "_body", "_attr_dict")
+
     class TempField(object):
+        __slots__ = ("instance", "field")
+
         def __init__(self, field, instance):
             self.instance = instance
             self.field = field
 
         def __getattr__(self, item):
-            related_field = self.field.model.get_properties_dict()[item]
-            if item in self.instance.attr_dict:
-                to_ret = getattr(self.instance.attr_dict, item)
-                if isinstance(to_ret, tuple):
+            model = self.field.model
+            related_field = model._fields_index[item]
+            if item in self.instance.obj:
+                to_ret = self.instance.obj[item]
+                if isinstance(to_ret, (list, tuple)):
                     to_ret = to_ret[0]
-                return NAME2TYPE[related_field.type](to_ret)
+                return model.coerce(related_field, to_ret)
 
             return self.instance.TempField(related_field, self)
 
     def __init__(self, obj):
         self.validate(obj)
         self.obj = obj
-        self.attr_dict = AttrDict(self.obj)
+        self._params = None
+        self._body = None
+        self._attr_dict = None
+
+    @classmethod
+    def reindex(cls):
+        """Rebuild the fields tables of the class.
+
+        Called on class creation, call it again if PROPERTIES is modified
+        afterwards.
+        """
+        cls._fields_index = {field.name: field for field in cls.PROPERTIES}
+        cls._body_properties = tuple(field.name for field in cls.PROPERTIES
+                                     if field.location == "body")
+        cls._params_properties = tuple(field.name
+                                       for field in cls.PROPERTIES
+                                       if field.location != "body")
+        cls._body_names = frozenset(cls._body_properties)
+        cls._params_names = frozenset(cls._params_properties)
+        # only the plain named types - resolving dynamic types on class
+        # creation would break circular imports of models
+        cls._coercers = {field.name: NAME2TYPE[field._type]
+                         for field in cls.PROPERTIES
+                         if isinstance(getattr(field, "_type", None),
+                                       six.string_types) and
+                         field._type in NAME2TYPE}
+        cls._validator = None
+        cls._shallow_validator = None
+
+    @classmethod
+    def coerce(cls, field, value):
+        coercer = cls._coercers.get(field.name)
+        if coercer is None:
+            coercer = NAME2TYPE[field.type]
+
+        return coercer(value)
 
     @classmethod
     def get_properties_dict(cls):
-        return {field.name: field for field in cls.PROPERTIES}
+        return dict(cls._fields_index)
+
+    @property
+    def attr_dict(self):
+        if self._attr_dict is None:
+            self._attr_dict = AttrDict(self.obj)
+
+        return self._attr_dict
 
     @property
     def params(self):
-        return {key: value for key, value in self.obj.items()
-                if key in self.params_properties}
+        if self._params is None:
+            self._params = {key: value for key, value in self.obj.items()
+                            if key in self._params_names}
+
+        return self._params
 
     @property
     def body(self):
-        return {key: value for key, value in self.obj.items()
-                if key in self.body_properties}
+        if self._body is None:
+            self._body = {key: value for key, value in self.obj.items()
+                          if key in self._body_names}
+
+        return self._body
 
     @property
     def params_properties(self):
-        return [field.name
-                for field in self.PROPERTIES if field.location != "body"]
+        return list(self._params_properties)
 
     @property
     def body_properties(self):
-        return [field.name
-                for field in self.PROPERTIES if field.location == "body"]
+        return list(self._body_properties)
 
     def __getattr__(self, item):
-        if item in self.body_properties:
-            return getattr(self.attr_dict, item)
+        if item in self._body_names:
+            try:
+                return view(self.obj[item])
+
+            except KeyError:
+                raise AttributeError(item)
 
-        related_field = self.get_properties_dict()[item]
-        if item in self.attr_dict:
-            to_ret = getattr(self.attr_dict, item)
-            if isinstance(to_ret, tuple):
+        related_field = self._fields_index[item]
+        if item in self.obj:
+            to_ret = self.obj[item]
+            if isinstance(to_ret, (list, tuple)):
                 to_ret = to_ret[0]
-            return NAME2TYPE[related_field.type](to_ret)
+            return self.coerce(related_field, to_ret)
 
         return self.TempField(related_field, self)
 
@@ -88,26 +262,33 @@ class AbstractAPIModel(object):
                 prop.location == "body"]
 
     @classmethod
-    def validate(cls, obj):
-        if not isinstance(obj, dict):
-            raise ValueError("Object must be of type dict! given {}".format(
-                obj))
+    def get_validator(cls, _compiling=None):
+        """Get the compiled validator of the model, compile it on first use.
 
-        keys = list(obj.keys())
-        if len(keys) < len(cls.get_required_props()):
-            raise ValueError("Invalid number of properties")
+        Note:
+            The validator is cached per class, modifying PROPERTIES after the
+            first validation requires calling :meth:`reindex`.
+        """
+        validator = cls.__dict__.get("_validator")
+        if validator is None:
+            validator = compile_validator(cls, _compiling)
+            cls._validator = validator
 
-        for field in cls.get_required_props():
-            if field.name not in keys:
-                raise RuntimeError("Missing required field {}".format(
-                    field.name))
+        return validator
 
-            if not isfit(obj[field.name], field):
-                raise RuntimeError("Object doesn't fit the field: {!r} "
-                                   "doesn't fit {!r} in {!r}".format(
-                    obj[field.name], field, field.name))
+    @classmethod
+    def validate(cls, obj):
+        return cls.get_validator()(obj)
 
-        return True
+    @classmethod
+    def validate_shallow(cls, obj):
+        """Validate only the presence of the required top level keys."""
+        validator = cls.__dict__.get("_shallow_validator")
+        if validator is None:
+            validator = compile_shallow_validator(cls)
+            cls._shallow_validator = validator
+
+        return validator(obj)
 
     def __str__(self):
         return str(self.PROPERTIES)
@@ -116,6 +297,10 @@ class AbstractAPIModel(object):
     def ref_name(cls):
         return cls.TITLE if cls.TITLE is not None else cls.__name__
 
+    @classmethod
+    def component_source(cls, type):
+        return cls
+
     @classmethod
     def examples(cls, schema_bank, index):
         return Example(value=cls.EXAMPLE)
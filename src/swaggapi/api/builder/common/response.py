@@ -8,6 +8,8 @@ from swaggapi.api.openapi.models import Example, Response, Media
 class AbstractResponse(AbstractAPIModel):
     EXAMPLES = {}
 
+    __slots__ = ()
+
     @classmethod
     def examples(cls, schema_bank, index):
         return Example(value=cls.EXAMPLES[index])
@@ -32,4 +34,4 @@ class AbstractResponse(AbstractAPIModel):
 
 
 class NoContentResponse(AbstractResponse):
-    pass
+    __slots__ = ()
@@ -0,0 +1,105 @@
+from __future__ import absolute_import
+
+import asyncio
+import inspect
+import functools
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+from django.utils.decorators import classonlymethod
+
+from swaggapi.api.builder.server import instrumentation
+from swaggapi.api.builder.server.request import DjangoRequestView
+from swaggapi.api.builder.server.exceptions import ServerError, BadRequest
+
+
+SYNC_HANDLERS_WORKERS = 32
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_default_executor():
+    """Get the thread pool shared by the sync handlers of async views."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=SYNC_HANDLERS_WORKERS,
+                    thread_name_prefix="swaggapi-sync-handler")
+
+    return _executor
+
+
+def call_sync_handler(handler, *args, **kwargs):
+    """Call a sync handler in a thread of the pool.
+
+    The database connections of the thread are handled like in django's
+    request cycle - the unusable or expired ones are closed before and after
+    the call, so they don't go stale or leak between requests.
+    """
+    close_old_connections()
+    try:
+        return handler(*args, **kwargs)
+
+    finally:
+        close_old_connections()
+
+
+class AsyncDjangoRequestView(DjangoRequestView):
+    """DjangoRequestView dispatching natively under ASGI.
+
+    The request is parsed and validated on the event loop, coroutine
+    handlers (`async def get(...)`) are awaited directly and sync handlers
+    run in a bounded thread pool - `SYNC_EXECUTOR`, or the pool shared by
+    all async views when None.
+    """
+    SYNC_EXECUTOR = None
+    view_is_async = True
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        view = super(AsyncDjangoRequestView, cls).as_view(**initkwargs)
+
+        async def async_view(request, *args, **kwargs):
+            return await view(request, *args, **kwargs)
+
+        return functools.update_wrapper(async_view, view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            request.model = self.parse_request(request)
+            method = request.method.lower()
+            if method in self.http_method_names:
+                handler = getattr(self, method, self.http_method_not_allowed)
+
+            else:
+                handler = self.http_method_not_allowed
+
+            started = instrumentation.start_handler()
+            if inspect.iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+
+            else:
+                response = await self.run_sync(handler, request, *args,
+                                               **kwargs)
+                if inspect.iscoroutine(response):
+                    # django's async views helpers (http_method_not_allowed)
+                    response = await response
+
+            instrumentation.record_handler(self.__class__,
+                                           self.current_method, started)
+            return response
+
+        except (BadRequest, ServerError) as e:
+            return self.error_response(e)
+
+    def run_sync(self, handler, *args, **kwargs):
+        executor = self.SYNC_EXECUTOR or get_default_executor()
+        context = contextvars.copy_context()
+        return asyncio.get_running_loop().run_in_executor(
+            executor, functools.partial(context.run, call_sync_handler,
+                                        handler, *args, **kwargs))
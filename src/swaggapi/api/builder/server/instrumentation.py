@@ -0,0 +1,191 @@
+from __future__ import absolute_import
+
+import time
+import threading
+
+try:
+    from contextvars import ContextVar
+
+except ImportError:  # python < 3.7 - no concurrent handlers on a thread
+    ContextVar = None
+
+
+# monotonic clock (python 3), wall clock on python 2
+clock = getattr(time, "perf_counter", time.time)
+
+READ_BODY = "read_body"
+PARSE = "parse"
+MODEL = "model"
+HANDLER = "handler"
+RESPONSE_VALIDATION = "response_validation"
+ENCODING = "encoding"
+STREAM = "stream"
+# the phases run by the handler, when it creates its response
+HANDLER_NESTED = frozenset((RESPONSE_VALIDATION, ENCODING))
+
+_observers = ()
+
+# the time spent in the nested phases of the running handler
+if ContextVar is not None:
+    _nested = ContextVar("swaggapi_nested_phases", default=None)
+    _get_nested = _nested.get
+    _set_nested = _nested.set
+
+else:
+    _local = threading.local()
+
+    def _get_nested():
+        return getattr(_local, "nested", None)
+
+    def _set_nested(nested):
+        _local.nested = nested
+
+
+def add_observer(observer):
+    """Install an observer of the request pipeline phases timings.
+
+    Observers are called with (request_type, method, phase, duration),
+    duration in seconds. The phases of a request are:
+
+    - read_body - reading the request body.
+    - parse - json parsing of the body and the query params.
+    - model - construction and validation of the params model.
+    - handler - the view method, without the response validation and
+      encoding of the response it creates.
+    - response_validation - validation of the response against its model.
+    - encoding - serialization of the response.
+    - stream - sending the items of a streamed response.
+    """
+    global _observers
+    _observers = _observers + (observer,)
+
+
+def remove_observer(observer):
+    global _observers
+    _observers = tuple(installed for installed in _observers
+                       if installed is not observer)
+
+
+def start():
+    """Get the start time of a phase, None when no observer is installed."""
+    return clock() if _observers else None
+
+
+def record(request_type, method, phase, started):
+    """Report a phase to the observers.
+
+    Args:
+        request_type (type): the request class.
+        method (str): the request method.
+        phase (str): the ended phase.
+        started (number): the phase's start time, as given by :func:`start`.
+
+    Returns:
+        number. the end time of the phase - the start time of the next one.
+    """
+    if started is None:
+        return None
+
+    now = clock()
+    if phase in HANDLER_NESTED:
+        nested = _get_nested()
+        if nested is not None:
+            nested[0] += now - started
+
+    for observer in _observers:
+        observer(request_type, method, phase, now - started)
+
+    return now
+
+
+def start_handler():
+    """Start the handler phase, see :func:`start`.
+
+    The nested phases recorded until :func:`record_handler` are subtracted
+    from the handler phase, so they aren't counted twice.
+    """
+    if not _observers:
+        return None
+
+    nested = [0.0]
+    _set_nested(nested)
+    return clock(), nested
+
+
+def record_handler(request_type, method, started):
+    """Report the handler phase, started by :func:`start_handler`."""
+    if started is None:
+        return None
+
+    started, nested = started
+    _set_nested(None)
+    now = clock()
+    for observer in _observers:
+        observer(request_type, method, HANDLER, now - started - nested[0])
+
+    return now
+
+
+class PhaseStats(object):
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        if duration < self.min:
+            self.min = duration
+
+        if duration > self.max:
+            self.max = duration
+
+    def __repr__(self):
+        return "<PhaseStats count={} mean={:.6f} min={:.6f} " \
+               "max={:.6f}>".format(self.count, self.mean, self.min, self.max)
+
+
+class PhaseAggregator(object):
+    """In memory observer aggregating the timings of every phase.
+
+    Example:
+        aggregator = PhaseAggregator()
+        add_observer(aggregator)
+        ...
+        aggregator.snapshot()[(GetCats, "post", "handler")].mean
+    """
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, request_type, method, phase, duration):
+        key = (request_type, method, phase)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = PhaseStats()
+
+            stats.add(duration)
+
+    def snapshot(self):
+        """Get the stats by (request_type, method, phase)."""
+        with self._lock:
+            snapshot = {}
+            for key, stats in self._stats.items():
+                copy = snapshot[key] = PhaseStats()
+                copy.count, copy.total, copy.min, copy.max = \
+                    stats.count, stats.total, stats.min, stats.max
+
+            return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
@@ -1,14 +1,16 @@
 from __future__ import absolute_import
 
 import os
-import json
 
 import requests
 from six.moves import http_client
 from django.http import JsonResponse
 from django.views.generic import View
 
+from swaggapi.api.codec import dumps, loads
 from swaggapi.api.builder.common.model import AbstractAPIModel
+from swaggapi.api.builder.server.response import Response, StreamingResponse
+from swaggapi.api.builder.server import instrumentation
 from swaggapi.api.builder.server.exceptions import ServerError, BadRequest
 
 
@@ -43,16 +45,57 @@ class Request(object):
         "patch": [],
         "trace": [],
     }
+    # response validation policy, the default policy is used when None
+    RESPONSE_VALIDATION = None
     valid_methods = ["get", "post", "delete", "put", "head", "patch", "trace"]
 
     @classmethod
-    def execute(cls, base_url, method, data, params=None, logger=None):
+    def get_responses_models(cls, method):
+        """Get the status code -> response model mapping of a method.
+
+        The method's models take precedence over the default ones, the
+        mapping is computed once per class and method.
+        """
+        cache = cls.__dict__.get("_responses_models")
+        if cache is None:
+            cache = {}
+            cls._responses_models = cache
+
+        responses_models = cache.get(method)
+        if responses_models is None:
+            responses_models = dict(cls.DEFAULT_RESPONSES or {})
+            responses_models.update(cls.RESPONSES_MODELS.get(method) or {})
+            cache[method] = responses_models
+
+        return responses_models
+
+    @classmethod
+    def execute(cls, base_url, method, data, params=None, logger=None,
+                session=None, timeout=None, headers=None):
+        """Send the request.
+
+        Args:
+            session (requests.Session): the session to send the request
+                with - reusing its connections, a new connection is opened
+                when None.
+            timeout (number / tuple): the timeout in seconds, or a
+                (connect, read) timeouts tuple.
+            headers (dict): additional headers of the request.
+        """
         url = os.path.join(base_url, cls.URI)
         if logger:
             logger.debug("request: %s - %s - %s - %s", url, method, data,
                          params)
 
-        response = requests.request(method, url, json=data, params=params)
+        headers = dict(headers or {})
+        if data is not None:
+            data = dumps(data)
+            headers["Content-Type"] = "application/json"
+
+        response = (session or requests).request(method, url, data=data,
+                                                 params=params,
+                                                 headers=headers,
+                                                 timeout=timeout)
 
         if logger:
             logger.debug("response: %s(%s) - %s",
@@ -66,54 +109,94 @@ class Request(object):
 class DjangoRequestView(View, Request):
     def dispatch(self, request, *args, **kwargs):
         try:
-            method = request.method.lower()
-            model = self.PARAMS_MODELS[method] \
-                if self.PARAMS_MODELS[method] is not None else \
-                        self.DEFAULT_MODEL
+            request.model = self.parse_request(request)
+            started = instrumentation.start_handler()
+            response = super(DjangoRequestView, self).dispatch(
+                request, *args, **kwargs)
+            instrumentation.record_handler(self.__class__,
+                                           self.current_method, started)
+            return response
+
+        except (BadRequest, ServerError) as e:
+            return self.error_response(e)
+
+    def parse_request(self, request):
+        """Build the params model of a request.
+
+        Also sets the dispatched method of the view.
+
+        Returns:
+            AbstractAPIModel. the model instance, or None if the method
+                doesn't have a params model.
+        """
+        method = request.method.lower()
+        self.current_method = method
+        model = self.PARAMS_MODELS[method] \
+            if self.PARAMS_MODELS[method] is not None else \
+                    self.DEFAULT_MODEL
+
+        if not (model is None or issubclass(model, AbstractAPIModel)):
+            raise ServerError(
+                details="Method params model should be subclass of"
+                        "{}".format(AbstractAPIModel),
+                model=model,
+                response=request
+            )
+
+        if model is not None and issubclass(model, AbstractAPIModel):
+            request_type = self.__class__
+            started = instrumentation.start()
+            try:
+                request_params = {}
+                body = request.body
+                started = instrumentation.record(request_type, method,
+                                                 instrumentation.READ_BODY,
+                                                 started)
+                if body.startswith(b"{"):
+                    request_params = loads(body)
+                request_params.update(dict(request.GET))
+                started = instrumentation.record(request_type, method,
+                                                 instrumentation.PARSE,
+                                                 started)
+
+            except Exception as e:
+                raise ServerError(
+                    details=str(e),
+                    model=model,
+                    response=request.body
+                )
+            try:
+                model = model(request_params)
+                instrumentation.record(request_type, method,
+                                       instrumentation.MODEL, started)
 
-            if not (model is None or issubclass(model, AbstractAPIModel)):
+            except Exception as e:
                 raise ServerError(
-                    details="Method params model should be subclass of"
-                            "{}".format(AbstractAPIModel),
+                    details=str(e),
                     model=model,
-                    response=request
+                    response=request_params
                 )
 
-            if model is not None and issubclass(model, AbstractAPIModel):
-                try:
-                    request_params = {}
-                    body = request.body.decode("utf-8")
-                    if body.startswith("{"):
-                        request_params = json.loads(body)
-                    request_params.update(dict(request.GET))
-
-                except Exception as e:
-                    raise ServerError(
-                        details=str(e),
-                        model=model,
-                        response=request.body
-                    )
-                try:
-                    model = model(request_params)
-
-                except Exception as e:
-                    raise ServerError(
-                        details=str(e),
-                        model=model,
-                        response=request_params
-                    )
-
-            request.model = model
-            return super(DjangoRequestView, self).dispatch(
-                request, *args, **kwargs)
+        return model
+
+    @staticmethod
+    def error_response(error):
+        status = http_client.BAD_REQUEST \
+            if isinstance(error, BadRequest) else \
+            http_client.INTERNAL_SERVER_ERROR
+
+        return JsonResponse(error.encode(), status=int(status))
 
-        except BadRequest as e:
-            return JsonResponse(e.encode(),
-                                status=int(http_client.BAD_REQUEST))
+    def respond(self, response, status, *args, **kwargs):
+        """Create a :class:`Response` bound to the dispatched method."""
+        return Response(response, status, request_type=self.__class__,
+                        method=self.current_method, *args, **kwargs)
 
-        except ServerError as e:
-            return JsonResponse(e.encode(),
-                                status=int(http_client.INTERNAL_SERVER_ERROR))
+    def respond_stream(self, items, status, **kwargs):
+        """Create a :class:`StreamingResponse` bound to the dispatched method.
+        """
+        return StreamingResponse(items, status, request_type=self.__class__,
+                                 method=self.current_method, **kwargs)
 
     @classmethod
     def implemented_methods(cls):
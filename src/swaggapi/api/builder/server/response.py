@@ -1,47 +1,243 @@
 from __future__ import absolute_import
 
-import inspect
+import sys
+import json
 
 from six.moves import http_client
-from django.http import JsonResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
 
+from swaggapi.api.codec import dumps
+from swaggapi.api.builder.utils import compile_fit
+from swaggapi.api.builder.common.fields import ArrayField
+from swaggapi.api.builder.server import instrumentation
 from swaggapi.api.builder.server.exceptions import ServerError
+from swaggapi.api.builder.server.validation import get_default_policy
+
+
+def get_response_model(request_type, method, status):
+    responses_models = request_type.get_responses_models(method)
+    if status not in responses_models:
+        raise ServerError(
+            details="status code given is not defined in either "
+                    "method dict or default dict",
+            model=request_type.RESPONSES_MODELS,
+            response=status
+        )
+
+    return responses_models[status]
+
+
+def get_validation_policy(request_type):
+    return request_type.RESPONSE_VALIDATION or get_default_policy()
+
+
+def render_json(data, encoder=DjangoJSONEncoder, safe=True,
+                json_dumps_params=None, **kwargs):
+    """Serialize a json response body the way JsonResponse does.
+
+    The configured codec is used, unless explicit `json_dumps_params` are
+    given.
+
+    Returns:
+        tuple. the body and the rest of the HttpResponse keyword arguments.
+    """
+    if safe and not isinstance(data, dict):
+        raise TypeError(
+            "In order to allow non-dict objects to be serialized set the "
+            "safe parameter to False."
+        )
+
+    kwargs.setdefault("content_type", "application/json")
+    if json_dumps_params is not None:
+        return json.dumps(data, cls=encoder, **json_dumps_params), kwargs
+
+    return dumps(data, default=encoder().default), kwargs
+
+
+def get_caller_binding(frame):
+    """Get the request class and method of a view method frame."""
+    return frame.f_locals["self"].__class__, frame.f_code.co_name
 
 
 class Response(JsonResponse):
+    """Json response validated against the response models of a request.
+
+    The response is bound to its request class and method either explicitly
+    (`request_type` / `method` keyword arguments, see
+    :meth:`DjangoRequestView.respond`) or, when not given, by looking up the
+    calling view method frame.
+
+    Validation follows the `RESPONSE_VALIDATION` policy of the request, or
+    the default policy (see :mod:`swaggapi.api.builder.server.validation`).
+    """
     def __init__(self, response, status, *args, **kwargs):
+        request_type = kwargs.pop("request_type", None)
+        method = kwargs.pop("method", None)
         status = int(status)
-        stack = inspect.stack()
-        the_class = stack[1][0].f_locals["self"].__class__
-        the_method = stack[1][0].f_code.co_name
+        if request_type is None:
+            request_type, method = get_caller_binding(sys._getframe(1))
+
+        started = instrumentation.start()
+        try:
+            model = get_response_model(request_type, method, status)
+            try:
+                get_validation_policy(request_type).check(model, response)
+                started = instrumentation.record(
+                    request_type, method,
+                    instrumentation.RESPONSE_VALIDATION, started)
+
+            except Exception as e:
+                raise ServerError(
+                    details=str(e),
+                    model=str(model),
+                    response=response
+                )
+
+        except ServerError as e:
+            response = e.encode()
+            status = int(http_client.INTERNAL_SERVER_ERROR)
 
-        responses_models = the_class.RESPONSES_MODELS[the_method]
+        content, kwargs = render_json(response, *args, **kwargs)
+        instrumentation.record(request_type, method,
+                               instrumentation.ENCODING, started)
+        # the body is already serialized - skip JsonResponse's serialization
+        super(JsonResponse, self).__init__(content=content, status=status,
+                                           **kwargs)
 
+
+class StreamingResponse(StreamingHttpResponse):
+    """Json response streaming the items of an array field of its model.
+
+    The body is the `response` dict (the envelope) with the array field
+    filled by `items`, which can be any iterable (e.g. a generator).
+    The items are serialized, validated and flushed in chunks of
+    `chunk_size` items while the response is sent, so the whole body is
+    never held in memory.
+
+    The envelope and the status code are checked on creation (a failure
+    turns into an internal server error like in :class:`Response`).
+    The items are checked while streamed - as the status was already sent,
+    an invalid item aborts the stream when the validation policy is strict.
+
+    Keyword Args:
+        response (dict): the rest of the response, defaults to {}.
+        field (str): name of the streamed array field, may be omitted when
+            the response model has a single array field.
+        chunk_size (number): items serialized per flushed chunk.
+        encoder (type): json encoder class of the items.
+        request_type (type): request class the response is bound to.
+        method (str): request method the response is bound to.
+
+    The other keyword args (e.g. content_type, reason) are passed to
+    :class:`StreamingHttpResponse`.
+    """
+    CHUNK_SIZE = 100
+
+    def __init__(self, items, status, **kwargs):
+        request_type = kwargs.pop("request_type", None)
+        method = kwargs.pop("method", None)
+        envelope = kwargs.pop("response", None) or {}
+        field = kwargs.pop("field", None)
+        chunk_size = kwargs.pop("chunk_size", self.CHUNK_SIZE)
+        encoder = kwargs.pop("encoder", DjangoJSONEncoder)
+        kwargs.setdefault("content_type", "application/json")
+        status = int(status)
+        if request_type is None:
+            request_type, method = get_caller_binding(sys._getframe(1))
+
+        started = instrumentation.start()
         try:
-            if responses_models is None or status not in responses_models:
-                responses_models = the_class.DEFAULT_RESPONSES
+            model = get_response_model(request_type, method, status)
+            field = self.get_array_field(model, field)
+            try:
+                items = get_validation_policy(request_type).check_stream(
+                    model, dict(envelope, **{field.name: []}),
+                    compile_fit(field.items_type), items)
+                instrumentation.record(request_type, method,
+                                       instrumentation.RESPONSE_VALIDATION,
+                                       started)
 
-            if responses_models is None or status not in responses_models:
+            except Exception as e:
                 raise ServerError(
-                    details="status code given is not defined in either "
-                            "method dict or default dict",
-                    model=the_class.RESPONSES_MODELS,
-                    response=status
+                    details=str(e),
+                    model=str(model),
+                    response=envelope
                 )
-            else:
-                try:
-                    responses_models[status].validate(response)
 
-                except Exception as e:
-                    raise ServerError(
-                        details=str(e),
-                        model=str(responses_models[status]),
-                        response=response
-                    )
+            content = self.stream(envelope, field.name, items, chunk_size,
+                                  encoder)
+            content = self.timed(content, request_type, method)
 
         except ServerError as e:
-            response = e.encode()
+            content = [dumps(e.encode(), default=encoder().default)]
             status = int(http_client.INTERNAL_SERVER_ERROR)
 
-        super(Response, self).__init__(response, status=status, *args,
-                                       **kwargs)
+        super(StreamingResponse, self).__init__(content, status=status,
+                                                **kwargs)
+
+    @staticmethod
+    def get_array_field(model, name=None):
+        if name is None:
+            fields = [field for field in model.PROPERTIES
+                      if isinstance(field, ArrayField)]
+            if len(fields) != 1:
+                raise ServerError(
+                    details="streamed array field must be given when the "
+                            "model doesn't have exactly one array field",
+                    model=str(model),
+                    response=name
+                )
+
+            return fields[0]
+
+        field = model.get_properties_dict().get(name)
+        if not isinstance(field, ArrayField):
+            raise ServerError(
+                details="streamed field {!r} isn't an array field of the "
+                        "model".format(name),
+                model=str(model),
+                response=name
+            )
+
+        return field
+
+    @staticmethod
+    def timed(content, request_type, method):
+        if instrumentation.start() is None:
+            return content
+
+        return StreamingResponse._timed(content, request_type, method)
+
+    @staticmethod
+    def _timed(content, request_type, method):
+        started = instrumentation.start()
+        for chunk in content:
+            yield chunk
+
+        instrumentation.record(request_type, method, instrumentation.STREAM,
+                               started)
+
+    @staticmethod
+    def stream(envelope, name, items, chunk_size, encoder):
+        default = encoder().default
+        envelope = {key: value for key, value in envelope.items()
+                    if key != name}
+        head = dumps(envelope, default=default)[:-1]
+        if envelope:
+            head += b","
+
+        yield head + dumps(name) + b":["
+        separator = b""
+        chunk = []
+        for item in items:
+            chunk.append(dumps(item, default=default))
+            if len(chunk) >= chunk_size:
+                yield separator + b",".join(chunk)
+                separator = b","
+                chunk = []
+
+        if chunk:
+            yield separator + b",".join(chunk)
+
+        yield b"]}"
@@ -0,0 +1,172 @@
+from __future__ import absolute_import
+
+import time
+import logging
+import itertools
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationPolicy(object):
+    """Defines how outgoing responses are validated against their models.
+
+    Strict policies raise on invalid responses (the server then answers with
+    an internal server error), the others count and log the failures.
+    """
+    STRICT = True
+
+    def __init__(self):
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def should_validate(self):
+        return True
+
+    def validate(self, model, response):
+        model.validate(response)
+
+    def validate_item(self, model, item, fit):
+        if not fit(item):
+            raise RuntimeError("Item doesn't fit {!r}: {!r}".format(model,
+                                                                   item))
+
+    def check(self, model, response):
+        if self.should_validate():
+            self._run(self.validate, model, response)
+
+    def check_stream(self, model, envelope, fit, items):
+        """Validate a streamed response.
+
+        The envelope (the response without its streamed array) is validated
+        immediately, the array items lazily while they are consumed.
+
+        Args:
+            model (type): the response model.
+            envelope (dict): the response, the streamed array left empty.
+            fit (function): compiled check of a single item.
+            items (iterable): the items of the streamed array.
+
+        Returns:
+            iterable. the items, validated while iterated.
+        """
+        if not self.should_validate():
+            return items
+
+        self._run(self.validate, model, envelope)
+        return self._checked_items(model, fit, items)
+
+    def _checked_items(self, model, fit, items):
+        for item in items:
+            self._run(self.validate_item, model, item, fit)
+            yield item
+
+    def _run(self, validate, model, obj, *args):
+        if self.STRICT:
+            validate(model, obj, *args)
+            return
+
+        try:
+            validate(model, obj, *args)
+
+        except Exception as e:
+            self.report(model, obj, e)
+
+    def report(self, model, response, error):
+        with self._lock:
+            self.failures += 1
+
+        logger.warning("Response doesn't fit %s: %s", model, error)
+
+
+class FullValidation(ValidationPolicy):
+    """Validate every response entirely."""
+
+
+class NoValidation(ValidationPolicy):
+    """Never validate responses."""
+    def should_validate(self):
+        return False
+
+
+class ShallowValidation(ValidationPolicy):
+    """Validate only the top level keys of every response."""
+    def validate(self, model, response):
+        model.validate_shallow(response)
+
+    def check_stream(self, model, envelope, fit, items):
+        self.validate(model, envelope)
+        return items
+
+
+class SampledValidation(ValidationPolicy):
+    """Validate one of every `every` responses."""
+    STRICT = False
+
+    def __init__(self, every):
+        if every < 1:
+            raise ValueError("every must be at least 1, given {}".format(
+                every))
+
+        super(SampledValidation, self).__init__()
+        self.every = every
+        self._counter = itertools.count()
+
+    def should_validate(self):
+        return next(self._counter) % self.every == 0
+
+
+class BudgetValidation(ValidationPolicy):
+    """Validate responses while spending at most `budget` seconds a second.
+
+    Once the validation time within the current second exceeds the budget,
+    responses pass unvalidated until the next second.
+    """
+    STRICT = False
+
+    def __init__(self, budget):
+        super(BudgetValidation, self).__init__()
+        self.budget = budget
+        self._window = 0
+        self._spent = 0.0
+
+    def should_validate(self):
+        window = int(time.time())
+        if window != self._window:
+            with self._lock:
+                if window != self._window:
+                    self._window = window
+                    self._spent = 0.0
+
+        return self._spent < self.budget
+
+    def _timed(self, validate, *args):
+        started = time.time()
+        try:
+            validate(*args)
+
+        finally:
+            spent = time.time() - started
+            with self._lock:
+                self._spent += spent
+
+    def validate(self, model, response):
+        self._timed(super(BudgetValidation, self).validate, model, response)
+
+    def validate_item(self, model, item, fit):
+        self._timed(super(BudgetValidation, self).validate_item,
+                    model, item, fit)
+
+
+_default_policy = FullValidation()
+
+
+def get_default_policy():
+    return _default_policy
+
+
+def set_default_policy(policy):
+    """Set the validation policy of requests not defining their own."""
+    global _default_policy
+    _default_policy = policy
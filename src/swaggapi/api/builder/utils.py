@@ -1,9 +1,17 @@
 from __future__ import absolute_import
 
+import json
+import hashlib
 from numbers import Number
+from contextlib import contextmanager
 
 from six import string_types
-from swaggapi.api.openapi.models import Referance
+from swaggapi.api.codec import dumps
+from swaggapi.api.openapi.models import Referance, Componenets
+from swaggapi.api.openapi.abstract_model import to_primitive
+
+
+COMPONENT_REFERENCE = "#/components/{}/{}"
 
 
 def get_dict_leafs(dict_a):
@@ -23,7 +31,326 @@ def get_dict_leafs(dict_a):
 
     return leafs
 
+
+def make_reference(type, name):
+    """Create a reference to the component `name` of the given type."""
+    return Referance(name, type,
+                     **{"$ref": COMPONENT_REFERENCE.format(type, name)})
+
+
+def _point(reference, key):
+    reference.type, reference.reference = key
+    reference.kwargs["$ref"] = COMPONENT_REFERENCE.format(*key)
+
+
+def _canonical(value, internal, order, positions):
+    if isinstance(value, dict):
+        reference = value.get("$ref")
+        target = internal.get(reference) \
+            if isinstance(reference, string_types) else None
+        if target is not None:
+            if target not in positions:
+                positions[target] = len(order)
+                order.append(target)
+
+            return {"$ref": "#{}".format(positions[target])}
+
+        return {key: _canonical(value[key], internal, order, positions)
+                for key in sorted(value)}
+
+    if isinstance(value, list):
+        return [_canonical(item, internal, order, positions)
+                for item in value]
+
+    return value
+
+
+def content_digest(type, fragment):
+    """Get the content address of a serialized component."""
+    return hashlib.sha1(type.encode("utf-8") + b":" + fragment).hexdigest()
+
+
+def cycle_digest(components):
+    """Get the content address of a cycle of components.
+
+    The references within the cycle are replaced by the positions of their
+    components, in an order which doesn't depend on the component the cycle
+    was entered from.
+
+    Args:
+        components (list): (type, content, reference) of the components -
+            their json compatible content, and the "$ref" string the others
+            reference them by.
+
+    Returns:
+        tuple. the digest, and the order of the components in it.
+    """
+    internal = {reference: index
+                for index, (_, _, reference) in enumerate(components)}
+    encoded = order = None
+    for start in range(len(components)):
+        candidate_order = [start]
+        positions = {start: 0}
+        candidate = []
+        for index in candidate_order:  # grows while walking
+            type, content, _ = components[index]
+            candidate.append([type, _canonical(content, internal,
+                                               candidate_order, positions)])
+
+        candidate = json.dumps(candidate, sort_keys=True,
+                               separators=(",", ":"), default=repr)
+        if encoded is None or candidate < encoded:
+            encoded, order = candidate, candidate_order
+
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest(), order
+
+
+class _Build(object):
+    """A component being built (or built but not named yet - in a cycle)."""
+    __slots__ = ("identity", "type", "name", "depth", "low", "pending",
+                 "members", "component", "references")
+
+    def __init__(self, identity, type, name, depth):
+        self.identity = identity
+        self.type = type
+        self.name = name
+        self.depth = depth
+        self.low = depth  # the lowest build in the stack referenced
+        self.pending = []  # (reference, recording) waiting for the name
+        self.members = []  # the built components of the cycle
+        self.component = None
+        self.references = None
+
+
+class SchemaBank(dict):
+    """Components bank, component type -> {name: component}.
+
+    The components are content addressed - a built component identical to
+    one in the bank is referenced instead of being added again. A component
+    whose name is taken by a different one is named <name>_2, <name>_3 and
+    so on, in build order.
+
+    Keeps track of the components references made while building - the
+    references made in a :meth:`recording` block, and the references of
+    every component built into the bank.
+
+    Attributes:
+        dependencies (dict): (type, name) -> set of the (type, name) of the
+            components referenced by the component.
+        created (list): (type, name) of the components built into the bank,
+            in creation order.
+        digests (dict): (type, name) -> content digest of the component,
+            see :func:`content_digest` and :func:`cycle_digest`.
+        fragments (dict): (type, name) -> serialized component.
+        names (dict): (type, name) -> the name the component was added
+            under, before it was suffixed to be free.
+    """
+    TYPES = tuple(field.name for field in Componenets.fields)
+
+    def __init__(self):
+        super(SchemaBank, self).__init__((type, {}) for type in self.TYPES)
+        self.dependencies = {}
+        self.created = []
+        self.digests = {}
+        self.fragments = {}
+        self.names = {}
+        self._recordings = []
+        self._contents = {}  # digest -> (keys, components)
+        self._identities = {}  # identity -> (key, component)
+        self._open = {}  # identity -> _Build not named yet
+        self._stack = []
+
+    @contextmanager
+    def recording(self):
+        """Record the components referenced directly in the block.
+
+        Yields:
+            set. the (type, name) of the referenced components.
+        """
+        references = set()
+        self._recordings.append(references)
+        try:
+            yield references
+
+        finally:
+            self._recordings.pop()
+
+    def reference(self, key):
+        if self._recordings:
+            self._recordings[-1].add(key)
+
+    def remove(self, key):
+        type, name = key
+        del self[type][name]
+        self.dependencies.pop(key, None)
+        self.digests.pop(key, None)
+        self.fragments.pop(key, None)
+        self.names.pop(key, None)
+
+    def find(self, digest):
+        """Get the (type, name) of the components of a digest, or None."""
+        found = self._contents.get(digest)
+        if found is None:
+            return None
+
+        keys, components = found
+        for (type, name), component in zip(keys, components):
+            if self[type].get(name) is not component:
+                return None  # removed since
+
+        return keys
+
+    def add(self, digest, components):
+        """Add components under free names.
+
+        Args:
+            digest (str): the content digest of the components.
+            components (list): (type, name, component) in the digest order.
+
+        Returns:
+            list. the (type, name) the components were added as.
+        """
+        keys = []
+        for type, base, component in components:
+            bank = self[type]
+            name = base
+            if name in bank:
+                index = 2
+                while "{}_{}".format(name, index) in bank:
+                    index += 1
+
+                name = "{}_{}".format(name, index)
+
+            key = (type, name)
+            bank[name] = component
+            self.names[key] = base
+            self.digests[key] = digest
+            self.created.append(key)
+            keys.append(key)
+
+        self._contents[digest] = (keys, [component
+                                         for _, _, component in components])
+        return keys
+
+    def build(self, model, type, index=None):
+        """Get a reference to the component of a model, building it once.
+
+        Args:
+            model (Field / AbstractAPIModel): the model of the component.
+            type (str): the component type - the method of the model
+                building it.
+            index (object): the index of the component in the model.
+
+        Returns:
+            Referance. the reference to the component. References within a
+                cycle are pointed to their components once it's built.
+        """
+        name = model.ref_name()
+        if index is not None:
+            name += str(index)
+
+        identity = (type, model.component_source(type), index)
+        built = self._identities.get(identity)
+        if built is not None:
+            key, component = built
+            if self[key[0]].get(key[1]) is component:
+                self.reference(key)
+                return make_reference(*key)
+
+        build = self._open.get(identity)
+        if build is not None:
+            # a cycle - the component references itself
+            return self._pending(build)
+
+        build = _Build(identity, type, name, len(self._stack))
+        self._open[identity] = build
+        self._stack.append(build)
+        try:
+            with self.recording() as references:
+                build.component = getattr(model, type)(self, index)
+
+        except Exception:
+            for member in build.members + [build]:
+                del self._open[member.identity]
+
+            raise
+
+        finally:
+            self._stack.pop()
+
+        build.references = references
+        if build.low < build.depth:
+            # references a component still being built - added with it
+            parent = self._stack[-1]
+            parent.members.extend(build.members)
+            parent.members.append(build)
+            parent.low = min(parent.low, build.low)
+            build.members = None
+            return self._pending(build)
+
+        return self._add_built(build.members + [build])
+
+    def _pending(self, build):
+        reference = make_reference(build.type, "")
+        recording = self._recordings[-1] if self._recordings else None
+        build.pending.append((reference, recording))
+        current = self._stack[-1]
+        current.low = min(current.low, build.low)
+        return reference
+
+    def _add_built(self, builds):
+        root = builds[-1]
+        if len(builds) == 1 and not root.pending:
+            fragment = dumps(to_primitive(root.component))
+            digest = content_digest(root.type, fragment)
+
+        else:
+            fragment = None
+            keys = [(build.type, "\0{}".format(position))
+                    for position, build in enumerate(builds)]
+            for build, key in zip(builds, keys):
+                for reference, _ in build.pending:
+                    _point(reference, key)
+
+            contents = [(build.type, to_primitive(build.component),
+                         COMPONENT_REFERENCE.format(*key))
+                        for build, key in zip(builds, keys)]
+
+            digest, order = cycle_digest(contents)
+            builds = [builds[index] for index in order]
+
+        keys = self.find(digest)
+        added = keys is None
+        if added:
+            keys = self.add(digest, [(build.type, build.name,
+                                      build.component)
+                                     for build in builds])
+
+        for build, key in zip(builds, keys):
+            del self._open[build.identity]
+            self._identities[build.identity] = (key, self[key[0]][key[1]])
+            for reference, recording in build.pending:
+                _point(reference, key)
+                if recording is not None:
+                    recording.add(key)
+
+            if build is root:
+                root_key = key
+
+        if added:
+            for build, key in zip(builds, keys):
+                self.dependencies[key] = build.references
+                self.fragments[key] = fragment or \
+                    dumps(to_primitive(build.component))
+
+        self.reference(root_key)
+        return make_reference(*root_key)
+
+
 def get_schema(model, schema_bank, type, index=None):
+    if isinstance(schema_bank, SchemaBank):
+        return schema_bank.build(model, type, index)
+
     ref_name = model.ref_name()
     if index is not None:
         ref_name += str(index)
@@ -31,19 +358,18 @@ def get_schema(model, schema_bank, type, index=None):
     if not ref_name in schema_bank[type]:
         handler = getattr(model, type)
         schema_bank[type][ref_name] = None  # place holder to prevent recursion
-        schema = handler(schema_bank, index)
-        schema_bank[type][ref_name] = schema
+        schema_bank[type][ref_name] = handler(schema_bank, index)
 
-    return Referance(ref_name, type,
-                     **{"$ref": "#/components/{}/{}".format(type, ref_name)})
+    return make_reference(type, ref_name)
 
 
 def isfit(obj, class_name):
-    from swaggapi.api.builder.common.model import AbstractAPIModel
+    from swaggapi.api.builder.common.model import AbstractAPIModel, unwrap
     from swaggapi.api.builder.common.fields import (StringField,
                                                     BoolField,
                                                     NumberField,
                                                     ModelField, ArrayField)
+    obj = unwrap(obj)
     if isinstance(class_name, StringField):
         return isinstance(obj, string_types)
 
@@ -71,3 +397,139 @@ def isfit(obj, class_name):
 
     else:
         return isinstance(obj, class_name)
+
+
+def compile_fit(class_name, _compiling=None):
+    """Compile the :func:`isfit` check of a field / model into a callable.
+
+    All the type dispatching of :func:`isfit` is done once, so the returned
+    callable only runs the checks relevant to the given field.
+    """
+    from swaggapi.api.builder.common.model import (AbstractAPIModel,
+                                                   ListView)
+    from swaggapi.api.builder.common.fields import (StringField,
+                                                    BoolField,
+                                                    NumberField,
+                                                    ModelField, ArrayField)
+    if isinstance(class_name, StringField):
+        return lambda obj: isinstance(obj, string_types)
+
+    elif isinstance(class_name, BoolField):
+        return lambda obj: isinstance(obj, bool)
+
+    elif isinstance(class_name, NumberField):
+        return lambda obj: isinstance(obj, Number)
+
+    elif isinstance(class_name, ModelField):
+        return compile_model_fit(class_name.model, _compiling)
+
+    elif isinstance(class_name, ArrayField):
+        fit_item = compile_fit(class_name.items_type, _compiling)
+
+        def fit_array(obj):
+            if not isinstance(obj, list):
+                if not isinstance(obj, ListView):
+                    return False
+
+                obj = obj._items
+
+            for item in obj:
+                if not fit_item(item):
+                    return False
+
+            return True
+
+        return fit_array
+
+    elif isinstance(class_name, type) and \
+            issubclass(class_name, AbstractAPIModel):
+        return compile_model_fit(class_name, _compiling)
+
+    elif isinstance(class_name, type):
+        return lambda obj: isinstance(obj, class_name)
+
+    # unknown field types keep the exact isfit semantics
+    return lambda obj: isfit(obj, class_name)
+
+
+def compile_model_fit(model, _compiling=None):
+    """Get the validation callable of a model, inlined when possible."""
+    from swaggapi.api.builder.common.model import AbstractAPIModel
+    if model.validate.__func__ is not AbstractAPIModel.validate.__func__:
+        # the model defines its own validation - respect it
+        return model.validate
+
+    if _compiling is not None and model in _compiling:
+        # recursive model - it will be compiled by the time it's called
+        return model.validate
+
+    return model.get_validator(_compiling)
+
+
+def compile_validator(model, _compiling=None):
+    """Compile the validation plan of a model class into a callable.
+
+    The returned callable behaves like :meth:`AbstractAPIModel.validate` -
+    it returns True or raises on an invalid object.
+    """
+    from swaggapi.api.builder.common.model import AttrView
+    _compiling = set() if _compiling is None else _compiling
+    _compiling.add(model)
+    try:
+        required = tuple((field.name, field, compile_fit(field, _compiling))
+                         for field in model.get_required_props())
+
+    finally:
+        _compiling.discard(model)
+
+    required_count = len(required)
+
+    def validator(obj):
+        if not isinstance(obj, dict):
+            if not isinstance(obj, AttrView):
+                raise ValueError("Object must be of type dict! given "
+                                 "{}".format(obj))
+
+            obj = obj._obj
+
+        if len(obj) < required_count:
+            raise ValueError("Invalid number of properties")
+
+        for name, field, fit in required:
+            if name not in obj:
+                raise RuntimeError("Missing required field {}".format(name))
+
+            if not fit(obj[name]):
+                raise RuntimeError("Object doesn't fit the field: {!r} "
+                                   "doesn't fit {!r} in {!r}".format(
+                    obj[name], field, name))
+
+        return True
+
+    return validator
+
+
+def compile_shallow_validator(model):
+    """Compile a validator checking only the top level keys of a model."""
+    from swaggapi.api.builder.common.model import AttrView
+    names = tuple(field.name for field in model.get_required_props())
+    required_count = len(names)
+
+    def validator(obj):
+        if not isinstance(obj, dict):
+            if not isinstance(obj, AttrView):
+                raise ValueError("Object must be of type dict! given "
+                                 "{}".format(obj))
+
+            obj = obj._obj
+
+        if len(obj) < required_count:
+            raise ValueError("Invalid number of properties")
+
+        for name in names:
+            if name not in obj:
+                raise RuntimeError("Missing required field {}".format(name))
+
+        return True
+
+    return validator
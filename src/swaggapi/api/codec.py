@@ -0,0 +1,143 @@
+"""Json codecs used by the server, the client and the spec encoding.
+
+The standard library codec is used by default, a faster one can be picked
+with :func:`set_codec` - by name ("json", "orjson", "ujson"), or "auto" for
+the fastest installed one.
+"""
+from __future__ import absolute_import
+
+import sys
+import json
+
+import six
+
+
+class JsonCodec(object):
+    """The standard library json codec."""
+    NAME = "json"
+    # json.loads handles bytes directly since python 3.6
+    DECODE_BYTES = six.PY3 and sys.version_info < (3, 6)
+
+    def dumps(self, obj, default=None):
+        """Serialize an object into minified utf-8 encoded json.
+
+        Args:
+            obj (object): the object to serialize.
+            default (function): called for objects that can't be serialized
+                otherwise, should return a serializable version of the object
+                or raise TypeError.
+
+        Returns:
+            bytes. the serialized object.
+        """
+        return json.dumps(obj, default=default,
+                          separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data):
+        """Deserialize json given as bytes or text."""
+        if self.DECODE_BYTES and isinstance(data, bytes):
+            data = data.decode("utf-8")
+
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    NAME = "orjson"
+
+    def __init__(self):
+        import orjson
+        self.orjson = orjson
+
+    def dumps(self, obj, default=None):
+        return self.orjson.dumps(obj, default=default,
+                                 option=self.orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data):
+        return self.orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    NAME = "ujson"
+
+    def __init__(self):
+        import ujson
+        self.ujson = ujson
+
+    def dumps(self, obj, default=None):
+        return self.ujson.dumps(obj, default=default,
+                                ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data):
+        return self.ujson.loads(data)
+
+
+CODECS = {codec.NAME: codec for codec in (JsonCodec, OrjsonCodec, UjsonCodec)}
+# fastest first
+PREFERENCE = ("orjson", "ujson", "json")
+
+_codec = JsonCodec()
+
+
+def get_codec():
+    return _codec
+
+
+def set_codec(codec="auto"):
+    """Set the json codec used by swaggapi.
+
+    Args:
+        codec (str / JsonCodec): codec name, "auto" for the fastest installed
+            codec, or a codec instance.
+
+    Returns:
+        JsonCodec. the codec in use.
+    """
+    global _codec
+    if codec == "auto":
+        for name in PREFERENCE:
+            try:
+                codec = CODECS[name]()
+                break
+
+            except ImportError:
+                continue
+
+    elif isinstance(codec, six.string_types):
+        codec = CODECS[codec]()
+
+    _codec = codec
+    return _codec
+
+
+def unwrap_default(default=None):
+    """Get a `default` hook serializing the views of parsed payloads.
+
+    The models' attribute views (see
+    :mod:`swaggapi.api.builder.common.model`) are serialized as the parsed
+    values behind them, other objects are passed to `default`.
+    """
+    def encode_default(obj):
+        from swaggapi.api.builder.common.model import unwrap
+        value = unwrap(obj)
+        if value is not obj:
+            return value
+
+        if default is None:
+            raise TypeError("Object of type {} is not JSON "
+                            "serializable".format(type(obj).__name__))
+
+        return default(obj)
+
+    return encode_default
+
+
+_unwrap_default = unwrap_default()
+
+
+def dumps(obj, default=None):
+    return _codec.dumps(obj, default=_unwrap_default if default is None else
+                        unwrap_default(default))
+
+
+def loads(data):
+    return _codec.loads(data)
@@ -2,8 +2,11 @@ from __future__ import absolute_import
 
 import re
 import json
+import threading
+from contextlib import contextmanager
 from textwrap import TextWrapper
 
+import six
 from six import add_metaclass
 
 from .utils import is_instance
@@ -13,6 +16,66 @@ class OpenAPIError(Exception):
     pass
 
 
+class OpenAPIValidationError(OpenAPIError):
+    """All of the errors found by :func:`validate_tree`.
+
+    Attributes:
+        errors (list): (json pointer, exception) of every error.
+    """
+    def __init__(self, errors):
+        self.errors = errors
+        super(OpenAPIValidationError, self).__init__(
+            "{} invalid objects:\n{}".format(
+                len(errors), "\n".join("{}: {}".format(path, error)
+                                        for path, error in errors)))
+
+
+# objects are validated on creation
+VALIDATE = "validate"
+# objects are validated later on, by validate_tree
+DEFERRED = "deferred"
+# objects are not validated at all, for internal builders
+TRUSTED = "trusted"
+
+_mode = threading.local()
+
+
+def get_validation_mode():
+    """Get the validation mode of objects created by the current thread."""
+    return getattr(_mode, "value", VALIDATE)
+
+
+@contextmanager
+def validation_mode(mode):
+    """Set the validation mode of the objects created in the block.
+
+    Example:
+        with validation_mode(DEFERRED):
+            api = OpenAPI(...)
+
+        validate_tree(api)
+    """
+    previous = get_validation_mode()
+    _mode.value = mode
+    try:
+        yield
+
+    finally:
+        _mode.value = previous
+
+
+def report(errors, error):
+    """Raise an error, or add it to the errors list when one is given."""
+    if errors is None:
+        raise error
+
+    errors.append(error)
+
+
+def _escape_pointer(key):
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
 class OpenAPIPattern(object):
     def __init__(self, pattern, type, description):
         self.pattern = pattern
@@ -20,19 +83,240 @@ class OpenAPIPattern(object):
         self.description = description
 
 
+def encode_openapi(obj):
+    """Json `default` hook encoding OpenAPI objects."""
+    if isinstance(obj, OpenAPIObject):
+        return dict(obj.iter_fields())
+
+    raise TypeError("{!r} is not JSON serializable".format(obj))
+
+
+SCALAR_TYPES = six.string_types + six.integer_types + (float, type(None))
+# number of encoded parts buffered before a chunk is emitted
+FLUSH_PARTS = 4096
+
+_encode_string = json.encoder.encode_basestring_ascii
+_INFINITY = float("inf")
+
+
+def _encode_float(value):
+    if value != value:
+        return "NaN"
+
+    if value == _INFINITY:
+        return "Infinity"
+
+    if value == -_INFINITY:
+        return "-Infinity"
+
+    return repr(value)
+
+
+def _encode_scalar(value):
+    if isinstance(value, six.string_types):
+        return _encode_string(value)
+
+    if value is None:
+        return "null"
+
+    if value is True:
+        return "true"
+
+    if value is False:
+        return "false"
+
+    if isinstance(value, six.integer_types):
+        return "%d" % value
+
+    if isinstance(value, float):
+        return _encode_float(value)
+
+    raise TypeError("{!r} is not JSON serializable".format(value))
+
+
+def _json_key(key):
+    """Convert a dict key the way json does."""
+    if isinstance(key, six.string_types):
+        return key
+
+    if isinstance(key, (bool, type(None), float)):
+        return _encode_scalar(key)
+
+    if isinstance(key, six.integer_types):
+        return "%d" % key
+
+    raise TypeError("keys must be str, int, float, bool or None, "
+                    "not {!r}".format(key))
+
+
+def to_primitive(value):
+    """Convert a value holding OpenAPI objects to json compatible types.
+
+    The result is the same as a json round trip of the value - OpenAPI
+    objects become dicts without their None fields, tuples become lists and
+    dict keys become strings.
+    """
+    if isinstance(value, SCALAR_TYPES):
+        return value
+
+    if isinstance(value, OpenAPIObject):
+        return value.to_dict()
+
+    if isinstance(value, dict):
+        return {_json_key(key): to_primitive(item)
+                for key, item in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return [to_primitive(item) for item in value]
+
+    return value
+
+
+def _iterencode_items(items, parts):
+    parts.append("{")
+    first = True
+    for key, value in items:
+        if first:
+            first = False
+
+        else:
+            parts.append(",")
+
+        parts.append(_encode_string(_json_key(key)))
+        parts.append(":")
+        if isinstance(value, SCALAR_TYPES):
+            parts.append(_encode_scalar(value))
+
+        else:
+            for _ in _iterencode(value, parts):
+                yield
+
+        if len(parts) >= FLUSH_PARTS:
+            yield
+
+    parts.append("}")
+
+
+def _iterencode(value, parts):
+    """Append the json parts of a value, yields when parts should be flushed.
+    """
+    if isinstance(value, OpenAPIObject):
+        for _ in _iterencode_items(value.iter_fields(), parts):
+            yield
+
+    elif isinstance(value, dict):
+        for _ in _iterencode_items(value.items(), parts):
+            yield
+
+    elif isinstance(value, (list, tuple)):
+        parts.append("[")
+        first = True
+        for item in value:
+            if first:
+                first = False
+
+            else:
+                parts.append(",")
+
+            if isinstance(item, SCALAR_TYPES):
+                parts.append(_encode_scalar(item))
+
+            else:
+                for _ in _iterencode(item, parts):
+                    yield
+
+            if len(parts) >= FLUSH_PARTS:
+                yield
+
+        parts.append("]")
+
+    else:
+        parts.append(_encode_scalar(value))
+
+
+def iterencode(value):
+    """Encode a value holding OpenAPI objects into minified json chunks.
+
+    The chunks are produced while walking the tree, nothing but the chunk
+    in progress is held in memory.
+
+    Yields:
+        str. ascii json chunks.
+    """
+    parts = []
+    for _ in _iterencode(value, parts):
+        yield "".join(parts)
+        del parts[:]
+
+    if parts:
+        yield "".join(parts)
+
+
 class OpenAPIEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, OpenAPIObject):
-            return {key: value for key, value in obj.kwargs.items()
-                    if value is not None}
+            return encode_openapi(obj)
         
         return super(OpenAPIEncoder, self).default(obj)
 
 
+def _format_pointer(location):
+    keys = []
+    while location is not None:
+        location, key = location
+        keys.append(_escape_pointer(key))
+
+    return "/".join(reversed(keys))
+
+
+def validate_tree(root):
+    """Validate every object of a tree once, collecting all of the errors.
+
+    Raises:
+        OpenAPIValidationError: some of the objects are invalid.
+    """
+    errors = []
+    visited = set()
+    # locations are (parent location, key) chains, formatted on errors only
+    stack = [(root, (None, "#"))]
+    while stack:
+        value, location = stack.pop()
+        if isinstance(value, OpenAPIObject):
+            if id(value) in visited:
+                continue
+
+            visited.add(id(value))
+            object_errors = []
+            value.validate(object_errors)
+            if object_errors:
+                pointer = _format_pointer(location)
+                errors.extend((pointer, error) for error in object_errors)
+
+            items = value.kwargs.items()
+
+        elif isinstance(value, dict):
+            items = value.items()
+
+        elif isinstance(value, (list, tuple)):
+            items = enumerate(value)
+
+        else:
+            continue
+
+        children = [(child, (location, key)) for key, child in items
+                    if not isinstance(child, SCALAR_TYPES)]
+        children.reverse()
+        stack.extend(children)
+
+    if errors:
+        raise OpenAPIValidationError(errors)
+
+
 class OpenAPIObject(object):
     def __init__(self, **kwargs):
         self.kwargs = kwargs if kwargs is not None else {}
-        self.validate()
+        if get_validation_mode() == VALIDATE:
+            self.validate()
 
     def __getattr__(self, item):
         if item in self.kwargs:
@@ -52,13 +336,64 @@ class OpenAPIObject(object):
         res = dir(type(self)) + list(self.__dict__.keys())
         return res + list(self.kwargs.keys())
 
-    def json(self):
-        return json.loads(json.dumps(self, cls=OpenAPIEncoder, indent=4))
+    def iter_fields(self):
+        """Iterate the (name, value) pairs of the set fields, in json order.
+        """
+        for key, value in self.kwargs.items():
+            if value is not None:
+                yield key, value
+
+    def to_dict(self):
+        """Convert the object tree into json compatible dicts and lists."""
+        return {key: to_primitive(value) for key, value in self.iter_fields()}
 
-    def validate(self):
+    def json(self):
+        return self.to_dict()
+
+    def iterencode(self):
+        """Encode the object into minified json chunks, see :func:`iterencode`.
+        """
+        return iterencode(self)
+
+    def dump(self, fp, encoding=None):
+        """Stream the object as minified json into a file like object.
+
+        Args:
+            fp (file): object with a `write` method.
+            encoding (str): encoding of the written chunks for binary files,
+                text is written when None.
+        """
+        for chunk in iterencode(self):
+            fp.write(chunk if encoding is None else chunk.encode(encoding))
+
+    def validate(self, errors=None):
+        """Validate the object (not its children).
+
+        Args:
+            errors (list): errors are added to it instead of being raised.
+        """
         pass
 
 
+def compile_patterns(patterns):
+    """Combine patterns into a single precompiled regex.
+
+    Returns:
+        function. key -> the first pattern matching the key (from its start),
+            or None.
+    """
+    regex = re.compile("|".join("(?P<_{}>{})".format(index, pattern.pattern)
+                                for index, pattern in enumerate(patterns)))
+    groups = {"_{}".format(index): pattern
+              for index, pattern in enumerate(patterns)}
+
+    def match_pattern(key):
+        match = regex.match(key)
+        return groups[match.lastgroup] if match is not None else None
+
+    return match_pattern
+
+
 class PatternedOpenAPIObject(OpenAPIObject):
     patterns = NotImplemented
 
@@ -66,19 +401,24 @@ class PatternedOpenAPIObject(OpenAPIObject):
     def pattern_fields(self):
         return self.kwargs
 
+    @classmethod
+    def match_pattern(cls, key):
+        """Get the first pattern of the class matching a key, None if none do.
+        """
+        match_pattern = cls.__dict__.get("_match_pattern")
+        if match_pattern is None:
+            match_pattern = compile_patterns(cls.patterns)
+            cls._match_pattern = match_pattern
+
+        return match_pattern(key)
+
     @classmethod
     def is_matched(self, value):
-        if not is_instance(value, dict):
+        if not isinstance(value, dict):
             return False
 
         for arg, _value in value.items():
-            found = None
-            for pattern in self.patterns:
-                match = re.match(pattern.pattern, arg)
-                if match:
-                    found = pattern
-                    break
-
+            found = self.match_pattern(arg)
             if found is None:
                 return False
 
@@ -87,15 +427,9 @@ class PatternedOpenAPIObject(OpenAPIObject):
 
         return True
 
-    def validate_args_patterns(self):
+    def validate_args_patterns(self, errors=None):
         for arg, value in self.pattern_fields.items():
-            found = None
-            for pattern in self.patterns:
-                match = re.match(pattern.pattern, arg)
-                if match:
-                    found = pattern
-                    break
-
+            found = self.match_pattern(arg)
             if found is None:
                 wrapper = TextWrapper(initial_indent="        ",
                                       subsequent_indent="        ")
@@ -103,22 +437,33 @@ class PatternedOpenAPIObject(OpenAPIObject):
                     pattern.pattern, wrapper.fill(pattern.description))
                 for pattern in self.patterns]
 
-                raise OpenAPIError("No pattern found for given arg: {}."
-                                   "\nAvailable Patterns:\n{}".format(
-                    arg, "\n".join(available_patterns)))
+                report(errors, OpenAPIError(
+                    "No pattern found for given arg: {}."
+                    "\nAvailable Patterns:\n{}".format(
+                        arg, "\n".join(available_patterns))))
 
-            if not is_instance(value, found.type):
-                raise OpenAPIError("Value type invalid: {} expected {}".format(
-                    type(value), found.type))
+            elif not is_instance(value, found.type):
+                report(errors, OpenAPIError(
+                    "Value type invalid: {} expected {}".format(
+                        type(value), found.type)))
 
-    def validate(self):
-        self.validate_args_patterns()
+    def validate(self, errors=None):
+        self.validate_args_patterns(errors)
 
 
 class StaticOpenAPIMetaClass(type):
+    """Computes the fields tables of a static object class once, on creation.
+    """
+    def __init__(cls, name, bases, attrs):
+        super(StaticOpenAPIMetaClass, cls).__init__(name, bases, attrs)
+        fields = cls.fields if cls.fields is not NotImplemented else ()
+        cls._fields_dict = {field.name: field for field in fields}
+        cls._field_names = frozenset(cls._fields_dict)
+        cls._required_fields = [field for field in fields if field.required]
+
     @property
     def fields_dict(cls):
-        return {field.name: field for field in cls.fields}
+        return cls._fields_dict
 
     def __dir__(self):
         return dir(type(self)) + list(self.__dict__.keys()) + \
@@ -126,11 +471,12 @@ class StaticOpenAPIMetaClass(type):
 
     @property
     def required_fields(cls):
-        return [field for field in cls.fields if field.required]
+        return cls._required_fields
 
     def __getattr__(self, item):
-        if item in self.fields_dict:
-            return self.fields_dict[item]
+        fields_dict = self.__dict__.get("_fields_dict", {})
+        if item in fields_dict:
+            return fields_dict[item]
 
         raise OpenAPIError("No item {} in fields dict".format(item))
 
@@ -141,15 +487,23 @@ class StaticOpenAPIObject(OpenAPIObject):
 
     def __init__(self, **kwargs):
         super(StaticOpenAPIObject, self).__init__(**kwargs)
+        if get_validation_mode() == DEFERRED:
+            # the missing fields are set to None right after
+            missing = [field.name for field in self._required_fields
+                       if field.name not in self.kwargs]
+            if missing:
+                self.__dict__["_missing_fields"] = missing
+
         self.initiate_default_fields()
     
     def __setattr__(self, key, value):
-        fields_dict = {field.name: field for field in self.fields}
-        if key in list(fields_dict.keys()):
-            if not is_instance(value, fields_dict[key].type):
+        field = self._fields_dict.get(key)
+        if field is not None:
+            if get_validation_mode() == VALIDATE and \
+                    not is_instance(value, field.type):
                 raise OpenAPIError(
                     "Invalid value given! Must be of type: {}".format(
-                        fields_dict[key].type))
+                        field.type))
 
             self.kwargs[key] = value
             return
@@ -160,63 +514,78 @@ class StaticOpenAPIObject(OpenAPIObject):
     def static_fields(self):
         return self.kwargs
 
+    def iter_fields(self):
+        """Iterate the set fields - declared fields first, in their order."""
+        kwargs = self.kwargs
+        for field in self.fields:
+            value = kwargs.get(field.name)
+            if value is not None:
+                yield field.name, value
+
+        if len(kwargs) > len(self._field_names):
+            field_names = self._field_names
+            for key, value in kwargs.items():
+                if key not in field_names and value is not None:
+                    yield key, value
+
     def initiate_default_fields(self):
         for field in self.fields:
             if field.name not in self.kwargs:
                 self.kwargs[field.name] = None
 
-    def validate_required(self):
-        for field in self.fields:
-            if field.required:
-                if not field.name in self.kwargs:
-                    raise OpenAPIError("Missing required field: {}".format(
-                        field.name))
+    def validate_required(self, errors=None):
+        missing = self.__dict__.get("_missing_fields", ())
+        for field in self._required_fields:
+            if field.name in missing or not field.name in self.kwargs:
+                report(errors, OpenAPIError(
+                    "Missing required field: {}".format(field.name)))
 
-    def validate_type(self):
+    def validate_type(self, errors=None):
+        fields_dict = self._fields_dict
         for field, value in self.static_fields.items():
-            static_field = self.fields_dict[field]
-            if not is_instance(value, static_field.type):
-                raise OpenAPIError("invalid type given! "
-                                   "field: {!r}, got type {!r}".format(
-                    static_field, value, static_field.type))
-
-    def validate_no_extra(self):
-        all_fields_names = list(self.fields_dict.keys())
+            if value is None:
+                continue
+
+            static_field = fields_dict.get(field)
+            if static_field is not None and \
+                    not is_instance(value, static_field.type):
+                report(errors, OpenAPIError(
+                    "invalid type given! field: {!r}, got type {!r}".format(
+                        static_field, value, static_field.type)))
+
+    def validate_no_extra(self, errors=None):
+        all_fields_names = self._field_names
         for field in self.static_fields.keys():
             if field not in all_fields_names:
-                raise RuntimeError("{} object doesn't have {} field in its "
-                                   "openapi structure!".format(
-                    self.__class__.__name__, field))
+                report(errors, RuntimeError(
+                    "{} object doesn't have {} field in its openapi "
+                    "structure!".format(self.__class__.__name__, field)))
 
-    def validate(self):
-        self.validate_required()
-        self.validate_no_extra()
-        self.validate_type()
+    def validate(self, errors=None):
+        self.validate_required(errors)
+        self.validate_no_extra(errors)
+        self.validate_type(errors)
 
 
 class PatternedStaticOpenAPIObject(StaticOpenAPIObject,
                                    PatternedOpenAPIObject):
     @property
     def pattern_fields(self):
-        pattern_keys = list(self.kwargs.keys())
-        for field in self.fields:
-            if field.name in pattern_keys:
-                pattern_keys.remove(field.name)
-
-        return {key: self.kwargs[key] for key in pattern_keys}
+        field_names = self._field_names
+        return {key: value for key, value in self.kwargs.items()
+                if key not in field_names}
 
     @property
     def static_fields(self):
-        pattern_keys = list(self.pattern_fields.keys())
-
-        return {key: self.kwargs[key] for key in self.kwargs
-                if key not in pattern_keys}
-
-    def validate(self):
-        self.validate_required()
-        self.validate_no_extra()
-        self.validate_args_patterns()
-        self.validate_type()
+        field_names = self._field_names
+        return {key: value for key, value in self.kwargs.items()
+                if key in field_names}
+
+    def validate(self, errors=None):
+        self.validate_required(errors)
+        self.validate_no_extra(errors)
+        self.validate_args_patterns(errors)
+        self.validate_type(errors)
 
 
 class OpenAPIField(object):
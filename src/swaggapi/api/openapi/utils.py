@@ -9,71 +9,160 @@ from .types import (DynamicType,
                     SpecialType)
 
 
-def is_instance(value, class_name):
-    if value is None:
-        return True
+# type descriptor -> compiled checker
+_checkers = {}
 
-    if isinstance(class_name, SpecialType):
-        base_type = class_name.base_type
-        if not isinstance(value, base_type):
-            return False
-
-        if isinstance(class_name, Enum):
-            options = class_name.options
-            return value in options
-
-        elif isinstance(class_name, Map):
-            key_type = class_name.key_type
-            value_type = class_name.value_type
-            for key, value in value.items():
+
+def _never(value):
+    return False
+
+
+def _compile_special(class_name):
+    base_type = class_name.base_type
+    if isinstance(class_name, Enum):
+        options = class_name.options
+
+        def check_enum(value):
+            return isinstance(value, base_type) and value in options
+
+        return check_enum
+
+    if isinstance(class_name, Map):
+        key_type = class_name.key_type
+        value_type = class_name.value_type
+
+        def check_map(value):
+            if not isinstance(value, base_type):
+                return False
+
+            for key, item in value.items():
                 if not is_instance(key, key_type) or \
-                        not is_instance(value, value_type):
+                        not is_instance(item, value_type):
                     return False
 
             return True
 
-        elif isinstance(class_name, List):
-            type = class_name.type
+        return check_map
+
+    if isinstance(class_name, List):
+        item_type = class_name.type
+
+        def check_list(value):
+            if not isinstance(value, base_type):
+                return False
 
             for item in value:
-                if not isinstance(item, type):
+                if not isinstance(item, item_type):
                     return False
 
             return True
 
-        elif isinstance(class_name, MultiTypeList):
+        return check_list
+
+    if isinstance(class_name, MultiTypeList):
+        allowed_types = tuple(class_name.allowed_types)
+
+        def check_multi_type_list(value):
+            if not isinstance(value, base_type):
+                return False
+
             for item in value:
-                if not is_instance(item, tuple(class_name.allowed_types)):
+                if not is_instance(item, allowed_types):
                     return False
 
             return True
 
+        return check_multi_type_list
+
+    return _never
+
+
+def _compile_dynamic(class_name):
+    # resolved on first use - the models may not be defined yet on compile
+    resolved = []
+
+    def check_dynamic(value):
+        if not resolved:
+            resolved.append(compile_type(class_name.eval()))
+
+        return resolved[0](value)
+
+    return check_dynamic
+
+
+def _compile_tuple(class_name):
+    from .abstract_model import PatternedOpenAPIObject
+
+    checkers = []
+    resolved_types = []
+    for klass in class_name:
+        if isinstance(klass, DynamicType):
+            klass = klass.eval()
+
+        checkers.append(compile_type(klass))
+        resolved_types.append(klass)
+
+    # instances of patterned objects are also accepted within a tuple
+    patterned_types = tuple(klass for klass in resolved_types
+                            if isinstance(klass, type) and
+                            issubclass(klass, PatternedOpenAPIObject))
+
+    def check_tuple(value):
+        for checker in checkers:
+            if checker(value):
+                return True
+
+        return isinstance(value, patterned_types)
+
+    return check_tuple
+
+
+def compile_type(class_name):
+    """Compile a type descriptor into a checker of values.
+
+    Args:
+        class_name (type / tuple / CustomType): the type descriptor.
+
+    Returns:
+        function. value -> bool, with the semantics of :func:`is_instance`
+            (for values which aren't None).
+    """
+    checker = _checkers.get(class_name)
+    if checker is not None:
+        return checker
+
+    if isinstance(class_name, SpecialType):
+        checker = _compile_special(class_name)
+
     elif isinstance(class_name, OneOf):
-        return is_instance(value, tuple(class_name.types))
+        checker = compile_type(tuple(class_name.types))
 
     elif isinstance(class_name, DynamicType):
-        type = class_name.eval()
-        return is_instance(value, type)
+        checker = _compile_dynamic(class_name)
+
+    elif isinstance(class_name, tuple):
+        checker = _compile_tuple(class_name)
 
     else:
         from .abstract_model import PatternedOpenAPIObject
 
-        if isinstance(class_name, tuple):
-            new_class_name = []
+        if issubclass(class_name, PatternedOpenAPIObject):
+            checker = class_name.is_matched
 
-            for klass in class_name:
-                if is_instance(klass, DynamicType):
-                    new_class_name.append(klass.eval())
+        else:
+            def checker(value):
+                return isinstance(value, class_name)
 
-                else:
-                    new_class_name.append(klass)
+    _checkers[class_name] = checker
+    return checker
 
-            class_name = tuple(new_class_name)
 
-            if any(is_instance(value, klass) for klass in class_name):
-                return True
+def is_instance(value, class_name):
+    if value is None:
+        return True
 
-        elif issubclass(class_name, PatternedOpenAPIObject):
-            return class_name.is_matched(value)
+    checker = _checkers.get(class_name)
+    if checker is None:
+        checker = compile_type(class_name)
 
-        return isinstance(value, class_name)
+    return checker(value)
@@ -1,12 +1,31 @@
 from __future__ import absolute_import
 
+import os
+import io
 import re
+import sys
+import gzip
+import mmap
+import inspect
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
 
+import six
 from django.conf.urls import url
-from django.views.decorators.csrf import csrf_exempt
+from django.http import (HttpResponse,
+                         HttpResponseNotFound,
+                         HttpResponseNotModified)
 
-from swaggapi.api.builder.utils import get_schema
-from swaggapi.api.builder.common.fields import Field
+from six.moves.urllib.parse import quote
+
+from swaggapi.api.codec import dumps, loads, get_codec, set_codec
+from swaggapi.api.builder.utils import (get_schema,
+                                        SchemaBank,
+                                        cycle_digest,
+                                        content_digest)
+from swaggapi.api.builder.common.fields import Field, DynamicType
 from swaggapi.api.builder.common.response import (NoContentResponse,
                                                   AbstractResponse)
 from swaggapi.api.openapi.models import (Operation,
@@ -19,33 +38,827 @@ from swaggapi.api.openapi.models import (Operation,
                                          Schema,
                                          Server,
                                          Example)
+from swaggapi.api.openapi.abstract_model import (DEFERRED,
+                                                 TRUSTED,
+                                                 VALIDATE,
+                                                 to_primitive,
+                                                 validate_tree,
+                                                 validation_mode)
+
+
+logger = logging.getLogger(__name__)
+
+SPEC_URL = "swagger.json"
+# suffixes of the files of a compiled spec
+COMPRESSED_SUFFIX = ".gz"
+MANIFEST_SUFFIX = ".manifest"
+OPENAPI_VERSION = "3.0.1"
+COMPONENTS_REF = "#/components/"
+OPERATIONS = tuple(field.name for field in Path.fields
+                   if field.type is Operation)
+
+
+def csrf_exempt_view(view):
+    """Mark a view as csrf exempt.
+
+    Unlike django's csrf_exempt, the view isn't wrapped - async views stay
+    coroutine functions on every django version.
+    """
+    view.csrf_exempt = True
+    return view
+
+
+def etag_matches(if_none_match, etag):
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+
+        if tag == "*" or tag == etag:
+            return True
+
+    return False
+
+
+def make_etag(content):
+    return '"{}"'.format(hashlib.sha1(content).hexdigest())
+
+
+def serialize_object(items):
+    """Serialize a json object from its (key, serialized value) pairs."""
+    return b"{" + b",".join(dumps(key) + b":" + value
+                            for key, value in items) + b"}"
+
+
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+def sha256(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def map_file(path):
+    """Memory map a file for reading.
+
+    Returns:
+        memoryview. the mapped content, bytes read from the file on python 2.
+    """
+    with io.open(path, "rb") as mapped_file:
+        mapped = mmap.mmap(mapped_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        return memoryview(mapped)
+
+    except TypeError:  # python 2 - mmap doesn't support memoryview
+        return mapped[:]
+
+
+def as_bytes(content):
+    """Get the bytes of serialized content, copied out of a memoryview."""
+    return content if isinstance(content, bytes) else content.tobytes()
+
+
+def compress(content):
+    """Gzip content, reproducibly."""
+    compressed = io.BytesIO()
+    with gzip.GzipFile(fileobj=compressed, mode="wb", mtime=0) as gzip_file:
+        gzip_file.write(content)
+
+    return compressed.getvalue()
+
+
+class SerializedSpec(object):
+    """Serialized document, with the location of its servers field.
+
+    Variants of the document with other servers are spliced from the
+    serialized fields before and after the servers field.
+
+    Attributes:
+        content (bytes): the serialized document, or a memoryview of its
+            memory mapped artifact.
+        split (number): the offset of the end of the fields before servers.
+        resume (number): the offset of the fields after servers.
+        etag (str): the document's ETag.
+    """
+    __slots__ = ("content", "split", "resume", "etag")
+
+    def __init__(self, content, split, resume, etag=None):
+        self.content = content
+        self.split = split
+        self.resume = resume
+        self.etag = etag if etag is not None else make_etag(content)
+
+    @classmethod
+    def from_fields(cls, head, tail, servers=None):
+        """Join the serialized fields before and after the servers field.
+
+        Args:
+            head (bytes): serialized object of the fields before servers,
+                may not be empty.
+            tail (bytes): serialized object of the fields after servers.
+            servers (list): the servers of the document (as dicts).
+        """
+        split = len(head) - 1
+        servers = cls.serialize_servers(servers)
+        tail = b"}" if tail == b"{}" else b"," + tail[1:]
+        return cls(head[:-1] + servers + tail, split, split + len(servers))
+
+    @staticmethod
+    def serialize_servers(servers):
+        return b',"servers":' + dumps(servers) if servers else b""
+
+    def with_servers(self, servers):
+        """Serialize the document with the given servers (as dicts)."""
+        return as_bytes(self.content[:self.split]) + \
+            self.serialize_servers(servers) + \
+            as_bytes(self.content[self.resume:])
+
+
+def find_references(value):
+    """Find the components referenced in a json document (as dicts).
+
+    Yields:
+        tuple. the (type, name) of the referenced components.
+    """
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == "$ref" and isinstance(item, six.string_types):
+                if item.startswith(COMPONENTS_REF):
+                    type, _, name = item[len(COMPONENTS_REF):].partition("/")
+                    yield type, name
+
+            else:
+                for reference in find_references(item):
+                    yield reference
+
+    elif isinstance(value, list):
+        for item in value:
+            for reference in find_references(item):
+                yield reference
+
+
+def relocate_references(value, prefix):
+    """Point the components references of a json document to files.
+
+    The reference to a component becomes `prefix`<type>/<name>.json.
+    """
+    if isinstance(value, dict):
+        reference = value.get("$ref")
+        if isinstance(reference, six.string_types) and \
+                reference.startswith(COMPONENTS_REF):
+            type, _, name = reference[len(COMPONENTS_REF):].partition("/")
+            value = dict(value)
+            value["$ref"] = "{}{}/{}.json".format(prefix, type, quote(name))
+            return value
+
+        return {key: relocate_references(item, prefix)
+                for key, item in value.items()}
+
+    if isinstance(value, list):
+        return [relocate_references(item, prefix) for item in value]
+
+    return value
+
+
+def rename_references(value, names):
+    """Point the components references of a json document to new names.
+
+    Args:
+        value (object): the json document (as dicts).
+        names (dict): (type, name) -> new (type, name) of components.
+    """
+    if isinstance(value, dict):
+        reference = value.get("$ref")
+        if isinstance(reference, six.string_types) and \
+                reference.startswith(COMPONENTS_REF):
+            type, _, name = reference[len(COMPONENTS_REF):].partition("/")
+            key = names.get((type, name))
+            if key is not None:
+                value = dict(value)
+                value["$ref"] = "{}{}/{}".format(COMPONENTS_REF, *key)
+
+            return value
+
+        return {key: rename_references(item, names)
+                for key, item in value.items()}
+
+    if isinstance(value, list):
+        return [rename_references(item, names) for item in value]
+
+    return value
+
+
+def write_json(path, document):
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    with io.open(path, "wb") as json_file:
+        json_file.write(dumps(document))
+
+
+def source_modules(requests):
+    """Get the modules the document of requests is built from.
+
+    The modules of the requests, the models and fields they use (following
+    the dynamic types), and of their base classes.
+    """
+    modules = {__name__}
+    seen = set()
+    pending = list(requests)
+    while pending:
+        item = pending.pop()
+        if isinstance(item, dict):
+            pending.extend(item.values())
+            continue
+
+        if isinstance(item, (list, tuple)):
+            pending.extend(item)
+            continue
+
+        if isinstance(item, DynamicType):
+            item = item.eval()
+
+        if not (inspect.isclass(item) or isinstance(item, Field)) or \
+                id(item) in seen:
+            continue
+
+        seen.add(id(item))
+        klass = item if inspect.isclass(item) else type(item)
+        modules.update(base.__module__ for base in klass.__mro__)
+        if inspect.isclass(item):
+            pending.extend(getattr(item, name) for name in
+                           ("PARAMS_MODELS", "RESPONSES_MODELS", "PROPERTIES")
+                           if hasattr(item, name))
+
+        else:
+            pending.extend(getattr(item, "__dict__", {}).values())
+
+    return modules
+
+
+def get_request_tag(request):
+    """Get the first tag of a request's methods, None if it has none."""
+    for method in request.implemented_methods():
+        tags = request.TAGS.get(method)
+        if tags:
+            return tags[0]
+
+    return None
+
+
+SHARD_KEYS = {
+    "module": lambda request: request.__module__,
+    "tag": get_request_tag,
+}
+
+
+def build_shard(swagger_type, mount_url, validation, codec, requests):
+    """Build and serialize the path items and components of requests.
+
+    Runs in the process pool of :meth:`Swagger.build`.
+
+    Returns:
+        list. for every request - its path, serialized path item, the
+            components it references and the components created while
+            building it. The components are created in units (a cycle, or
+            a single component) of (digest, [(type, name, base name,
+            serialized component)], the components the unit references), in
+            creation order - the name is the one in the shard, the base name
+            the one before it was suffixed to be free.
+    """
+    set_codec(codec)
+    # only the paths and components are built - no need for info and tags
+    builder = swagger_type(None, requests, mount_url, spec_url=None,
+                           validation=validation)
+    bank = builder.scheme_bank
+    results = []
+    for request in requests:
+        units = []
+        for key in builder._build_requests([request]):
+            digest = bank.digests[key]
+            if not units or units[-1][0] != digest:
+                units.append((digest, [], set()))
+
+            units[-1][1].append(key + (bank.names[key],
+                                       builder._component_fragment(*key)))
+            units[-1][2].update(bank.dependencies[key])
+
+        path = builder._path_items[request][0]
+        results.append((path, builder._path_fragment(request),
+                        builder._references[request], units))
+
+    return results
 
 
 class Swagger(object):
-    def __init__(self, info, requests, mount_url, tags=None):
+    """OpenAPI document of a set of requests.
+
+    The document is built on first use, and served pre-serialized by the
+    spec view (at `spec_url` under the mount url, disabled when None).
+
+    `validation` is the validation mode of the build - by default the
+    document is validated once it's complete (raising OpenAPIValidationError
+    with all of the errors), the objects can also be validated on creation
+    (VALIDATE) or not at all (TRUSTED).
+
+    The spec view serves the document with the server url of the request,
+    the serialized variants of the last `SERVER_VARIANTS` server urls are
+    kept. Sub documents of a single tag (its operations and the components
+    they use) are served with the `tag` query param.
+
+    Requests can be registered, unregistered and replaced at runtime - only
+    their path items, the ones of the requests following them and the
+    components these reference are (re)built and re-serialized, so the
+    components are named as in a fresh build. The urls of the requests are
+    the ones registered when :meth:`get_django_urls` is called.
+
+    The document can be compiled ahead of time (:meth:`compile`), and
+    loaded from the compiled `artifact` instead of being built. When
+    `servers_from_request` is False the document is served with `servers`,
+    and gzip encoded to clients accepting it.
+    """
+    SERVER_VARIANTS = 16
+
+    def __init__(self, info, requests, mount_url, tags=None,
+                 spec_url=SPEC_URL, validation=DEFERRED, servers=None,
+                 servers_from_request=True, artifact=None):
         self.info = info
         self.tags = tags
-        self.requests = requests
+        self.requests = list(requests)
         self.mount_url = mount_url
+        self.spec_url = spec_url
+        self.validation = validation
+        self.servers = servers
+        self.servers_from_request = servers_from_request
+        self.artifact = artifact
+
+        self.scheme_bank = SchemaBank()
+        # request -> (path, path item) of the built requests
+        self._path_items = {}
+        # request -> the components it references directly
+        self._references = {}
+        # request -> the components created by its build
+        self._created = {}
+        # request -> serialized path item
+        self._path_fragments = {}
+        self._built = False
+
+        self._base_url_regex = re.compile(
+            r"(?P<base_url>.*?/{}).*".format(mount_url))
+        self._api = None
+        self._spec = None
+        # tag -> SerializedSpec of the tag's sub document
+        self._tag_specs = {}
+        # tag -> (gzip encoded document, etag)
+        self._compressed = {}
+        # (tag, base url) -> (serialized spec, etag), least recently used first
+        self._variants = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def api(self):
+        """The OpenAPI document, built on first access."""
+        if self._api is None:
+            with self._lock:
+                if self._api is None:
+                    self._build()
+                    self._api = self._build_file()
+
+        return self._api
+
+    def register(self, request):
+        """Add a request to the document, unless it fails to build."""
+        with self._lock:
+            if request in self.requests:
+                raise ValueError("{} is already registered".format(request))
+
+            self.requests.append(request)
+            if self._built:
+                try:
+                    self._build_requests([request])
+
+                except Exception:
+                    self.requests.remove(request)
+                    raise
+
+            self._changed()
+
+    def unregister(self, request):
+        """Remove a request, and the components only it references."""
+        with self._lock:
+            index = self.requests.index(request)
+            del self.requests[index]
+            if request in self._path_items:
+                self._rebuild([request], index)
+
+            self._changed()
+
+    def replace(self, old_request, new_request):
+        """Replace a registered request, keeping its position.
+
+        The new request and the following ones are built, the components
+        referenced only by the old request are removed. The old request is
+        kept when the new one fails to build.
+        """
+        with self._lock:
+            index = self.requests.index(old_request)
+            self.requests[index] = new_request
+            if self._built:
+                try:
+                    self._rebuild([old_request], index)
+
+                except Exception:
+                    self.requests[index] = old_request
+                    self._rebuild([new_request], index)
+                    self._changed()
+                    raise
+
+            self._changed()
+
+    def build(self, workers=None, shard_by="module"):
+        """Build and serialize the document in a process pool.
+
+        The requests are split into shards, each shard is built by a worker
+        with its own components bank. The shards are then merged in the
+        requests order - the components are named again by their content
+        as in the serial build, so the result is byte-identical to it.
+
+        Only the serialized document is built, the OpenAPI objects (`api`)
+        are still built serially when accessed - e.g. by the registry
+        methods. The requests must be importable by the workers.
+
+        Args:
+            workers (number): the number of processes, the number of cpus
+                when None.
+            shard_by (str / function): "module" or "tag", or a function
+                returning the shard key of a request.
+
+        Returns:
+            bytes. the serialized document.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        shard_key = SHARD_KEYS.get(shard_by, shard_by)
+        shards = OrderedDict()
+        for request in self.requests:
+            shards.setdefault(shard_key(request), []).append(request)
+
+        codec = get_codec().NAME
+        built = {}
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [executor.submit(build_shard, self.__class__,
+                                       self.mount_url, self.validation,
+                                       codec, shard)
+                       for shard in shards.values()]
+            for shard, future in zip(shards.values(), futures):
+                built.update(zip(shard, future.result()))
+
+        paths = OrderedDict()
+        bank = SchemaBank()  # the names and digests of the merged components
+        # shard -> (type, name) in the worker -> (type, name) in the document
+        names = {shard: {} for shard in shards}
+        for request in self.requests:
+            path, path_fragment, references, units = built[request]
+            shard_names = names[shard_key(request)]
+            for digest, components, unit_references in units:
+                keys = [(type, name) for type, name, _, _ in components]
+                cyclic = len(keys) > 1 or keys[0] in unit_references
+                renamed = any(shard_names.get(key, key) != key
+                              for key in unit_references)
+                if renamed:
+                    # the unit refers to components named differently here
+                    contents = [(type, rename_references(loads(fragment),
+                                                         shard_names),
+                                 "{}{}/{}".format(COMPONENTS_REF, type, name))
+                                for type, name, _, fragment in components]
+                    if cyclic:
+                        digest, order = cycle_digest(contents)
+                        components = [components[index] for index in order]
+                        keys = [keys[index] for index in order]
+
+                    else:
+                        type, content, _ = contents[0]
+                        fragment = dumps(content)
+                        digest = content_digest(type, fragment)
+                        components = [(type, keys[0][1], components[0][2],
+                                       fragment)]
+
+                merged = bank.find(digest)
+                if merged is None:
+                    # named from the base names, as in the serial build
+                    merged = bank.add(digest, [(type, base, fragment)
+                                               for type, _, base, fragment
+                                               in components])
+
+                shard_names.update(zip(keys, merged))
+                if merged[0] not in bank.fragments:
+                    rewrite = cyclic and (renamed or keys != merged)
+                    for (_, _, _, fragment), key in zip(components, merged):
+                        if rewrite:
+                            fragment = dumps(rename_references(
+                                loads(fragment), shard_names))
+
+                        bank.fragments[key] = fragment
+
+            if any(shard_names.get(key, key) != key for key in references):
+                path_fragment = dumps(rename_references(loads(path_fragment),
+                                                        shard_names))
+
+            paths[path] = path_fragment
 
-        self.scheme_bank = {
-            "schemas": {},
-            "responses": {},
-            "parameters": {},
-            "examples": {},
-            "requestBodies": {},
-            "headers": {},
-            "securitySchemes": {},
-            "links": {},
-            "callbacks": {}
-        }
+        spec = self._serialize_fragments(
+            paths.items(),
+            ((type, ((name, bank.fragments[(type, name)])
+                     for name in bank[type]))
+             for type in SchemaBank.TYPES))
+        with self._lock:
+            self.invalidate()
+            self._spec = spec
 
-        self.api = self._build_file()
+        return spec.content
+
+    def get_serialized_spec(self, tag=None):
+        """Get the :class:`SerializedSpec` of the document, built once.
+
+        Args:
+            tag (str): get the sub document of a tag's operations instead.
+
+        Raises:
+            ValueError. the tag isn't a tag of the operations.
+        """
+        spec = self._spec if tag is None else self._tag_specs.get(tag)
+        if spec is None:
+            with self._lock:
+                if tag is None:
+                    spec = self._spec
+                    if spec is None and self.artifact is not None:
+                        spec = self._load_artifact()
+
+                    if spec is None:
+                        spec = self._spec = self._serialize()
+
+                else:
+                    spec = self._tag_specs.get(tag)
+                    if spec is None:
+                        if tag not in self.get_tags():
+                            raise ValueError("Unknown tag {!r}".format(tag))
+
+                        spec = self._tag_specs[tag] = self._serialize_tag(tag)
+
+        return spec
+
+    def get_spec(self, base_url=None, tag=None):
+        """Get the minified serialized document and its (strong) ETag.
+
+        Args:
+            base_url (str): server url to set in the document, the document's
+                servers are kept when None.
+            tag (str): get the sub document of a tag's operations instead.
+
+        Returns:
+            tuple. (bytes, str) the serialized document and its ETag - the
+                document is a memoryview when loaded from the artifact, see
+                :func:`as_bytes`.
+        """
+        spec = self.get_serialized_spec(tag)
+        if base_url is None:
+            return spec.content, spec.etag
+
+        key = (tag, base_url)
+        with self._lock:
+            variant = self._variants.pop(key, None)
+            if variant is None:
+                content = spec.with_servers([{"url": base_url}])
+                variant = (content, make_etag(content))
+
+            self._variants[key] = variant
+            while len(self._variants) > self.SERVER_VARIANTS:
+                self._variants.popitem(last=False)
+
+        return variant
+
+    def get_compressed_spec(self, tag=None):
+        """Get the gzip encoded document (see :meth:`get_spec`), and its ETag.
+        """
+        compressed = self._compressed.get(tag)
+        if compressed is None:
+            spec = self.get_serialized_spec(tag)
+            with self._lock:
+                compressed = self._compressed.get(tag)
+                if compressed is None:
+                    content = compress(spec.content)
+                    compressed = (content, make_etag(content))
+                    self._compressed[tag] = compressed
+
+        return compressed
+
+    def compile(self, path, workers=None, shard_by="module"):
+        """Compile the document into files, to be loaded as `artifact`.
+
+        Writes the serialized document to `path`, its gzip encoding to
+        `path`.gz and a manifest with their sha256 and the
+        :meth:`fingerprint` of the document to `path`.manifest.
+
+        Args:
+            path (str): the path of the serialized document.
+            workers (number): build in a pool of that many processes (see
+                :meth:`build`), serially when None.
+            shard_by (str / function): the shards of the parallel build.
+
+        Returns:
+            str. the path of the serialized document.
+        """
+        if workers is not None:
+            self.build(workers, shard_by)
+
+        spec = self.get_serialized_spec()
+        content = as_bytes(spec.content)
+        compressed = compress(content)
+        with io.open(path, "wb") as spec_file:
+            spec_file.write(content)
+
+        with io.open(path + COMPRESSED_SUFFIX, "wb") as compressed_file:
+            compressed_file.write(compressed)
+
+        write_json(path + MANIFEST_SUFFIX, {
+            "fingerprint": self.fingerprint(),
+            "sha256": sha256(content),
+            "gzip_sha256": sha256(compressed),
+            "split": spec.split,
+            "resume": spec.resume,
+        })
+        return path
+
+    def fingerprint(self):
+        """Get the fingerprint of the document's sources - the registered
+        requests, the source of the modules defining them and their models
+        (see :func:`source_modules`), the codec, the info, tags, servers and
+        mount url.
+
+        A compiled artifact of other sources is stale, and isn't loaded.
+        """
+        requests = ["{}.{}:{}".format(request.__module__,
+                                      getattr(request, "__qualname__",
+                                              request.__name__),
+                                      request.URI)
+                    for request in self.requests]
+        sources = []
+        for name in sorted(source_modules(self.requests)):
+            path = getattr(sys.modules.get(name), "__file__", None)
+            if path is not None:
+                with io.open(path, "rb") as source_file:
+                    sources.append(sha256(source_file.read()))
+
+        return sha256(dumps([requests, sources, get_codec().NAME,
+                             self.mount_url, to_primitive(self.info),
+                             to_primitive(self.tags),
+                             to_primitive(self.servers)]))
+
+    def _load_artifact(self):
+        """Load the compiled document, None if it's missing, corrupted or
+        stale (compiled from other requests, models or settings).
+
+        The files are memory mapped - shared by all of the processes serving
+        the document. The artifact is only used until the document changes.
+        """
+        path, self.artifact = self.artifact, None
+        try:
+            with io.open(path + MANIFEST_SUFFIX, "rb") as manifest_file:
+                manifest = loads(manifest_file.read())
+
+            fingerprint = manifest["fingerprint"]
+            digests = (manifest["sha256"], manifest["gzip_sha256"])
+            split, resume = int(manifest["split"]), int(manifest["resume"])
+
+        except (IOError, OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Couldn't load the manifest of the compiled spec "
+                           "%s: %r", path, e)
+            return None
+
+        if fingerprint != self.fingerprint():
+            logger.warning("The compiled spec %s is stale - compiled from "
+                           "other requests, models or settings", path)
+            return None
+
+        try:
+            content = map_file(path)
+            compressed = map_file(path + COMPRESSED_SUFFIX)
+
+        except (IOError, OSError, ValueError) as e:
+            logger.warning("Couldn't load the compiled spec %s: %s", path, e)
+            return None
+
+        if (sha256(content), sha256(compressed)) != digests:
+            logger.warning("The compiled spec %s doesn't match its hash", path)
+            return None
+
+        self._spec = SerializedSpec(content, split, resume)
+        self._compressed[None] = (compressed, make_etag(compressed))
+        return self._spec
+
+    def get_tags(self):
+        """Get the tags of the operations, in order of first appearance."""
+        tags = OrderedDict()
+        for request in self.requests:
+            for method in request.implemented_methods():
+                for tag in request.TAGS.get(method) or ():
+                    tags[tag] = None
+
+        return list(tags)
+
+    def export(self, directory, tag=None, split_components=False):
+        """Write the document into a directory.
+
+        Args:
+            directory (str): the directory to write into.
+            tag (str): write the sub document of a tag's operations instead,
+                as <tag>.json.
+            split_components (bool): write every component into its own file
+                - components/<type>/<name>.json, referenced by relative $ref.
+
+        Returns:
+            str. the path of the written document.
+        """
+        spec = self.get_serialized_spec(tag)
+        path = os.path.join(directory, "{}.json".format(tag or "openapi"))
+        if not split_components:
+            with io.open(path, "wb") as json_file:
+                json_file.write(spec.content)
+
+            return path
+
+        document = loads(as_bytes(spec.content))
+        components = document.pop("components", {})
+        write_json(path, relocate_references(document, "components/"))
+        for type, named_components in components.items():
+            for name, component in named_components.items():
+                write_json(os.path.join(directory, "components", type,
+                                        "{}.json".format(name)),
+                           relocate_references(component, "../"))
+
+        return path
+
+    def get_base_url(self, request):
+        """Get the url the api is mounted on for a request, None if unknown.
+        """
+        match = self._base_url_regex.match(request.build_absolute_uri())
+        if match is None:
+            return None
+
+        return str(match.group("base_url"))
+
+    def spec_view(self, request, *args, **kwargs):
+        """Serve the document, answering 304 to a matching If-None-Match.
+
+        The servers of the served document is the url the api is mounted on
+        for the request, unless `servers_from_request` is False. Unknown tags
+        are answered with 404.
+        """
+        tag = request.GET.get("tag")
+        if tag is not None and tag not in self._tag_specs and \
+                tag not in self.get_tags():
+            return HttpResponseNotFound()
+
+        base_url = self.get_base_url(request) \
+            if self.servers_from_request else None
+        compressed = base_url is None and ACCEPTS_GZIP.search(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if compressed:
+            content, etag = self.get_compressed_spec(tag)
+
+        else:
+            content, etag = self.get_spec(base_url, tag)
+
+        if etag_matches(request.META.get("HTTP_IF_NONE_MATCH"), etag):
+            response = HttpResponseNotModified()
+
+        else:
+            response = HttpResponse(as_bytes(content),
+                                    content_type="application/json")
+            if compressed:
+                response["Content-Encoding"] = "gzip"
+
+        if base_url is None:
+            response["Vary"] = "Accept-Encoding"
+
+        response["ETag"] = etag
+        return response
 
     def get_django_urls(self):
-        return [url(r"^{}/?".format(request.URI),
-                    csrf_exempt(request.as_view()))
-                for request in self.requests]
+        urls = []
+        if self.spec_url is not None:
+            urls.append(url(r"^{}$".format(re.escape(self.spec_url)),
+                            self.spec_view))
+
+        urls.extend(url(r"^{}/?".format(request.URI),
+                        csrf_exempt_view(request.as_view()))
+                    for request in self.requests)
+        return urls
 
     def _build_parameters(self, param_model):
         params = []
@@ -96,76 +909,333 @@ class Swagger(object):
 
         return return_dict
 
-    def _build_paths(self):
+    def _build_path(self, request):
+        path_description = request.__doc__
+        path_summary = path_description.split("\n", 1)[0] \
+            if path_description else None
+        methods = request.implemented_methods()
+        path_methods = {}
+        parameters = []
+        default_responses = {}
+        if request.DEFAULT_RESPONSES is not None:
+            default_responses = self._build_responses(
+                request.DEFAULT_RESPONSES)
+
+        default_body = None
+        if request.DEFAULT_MODEL is not None:
+            default_body, parameters = self._build_parameters(
+                request.DEFAULT_MODEL
+            )
+
+        for method in methods:
+            description = request.__doc__
+            summary = description.split("\n", 1)[
+                0] if description else None
+
+            params = parameters
+            request_body = None
+            if request.PARAMS_MODELS[method] is not None:
+                request_body, params = self._build_parameters(
+                    request.PARAMS_MODELS[method])
+
+            elif default_body is not None:
+                request_body = default_body
+
+            responses = {}
+            if request.RESPONSES_MODELS[method] is not None:
+                responses = self._build_responses(
+                    request.RESPONSES_MODELS[method])
+
+            operation_responses = default_responses.copy()
+            operation_responses.update(responses)
+
+            if operation_responses == {}:
+                operation_responses = None
+
+            operation = Operation(tags=request.TAGS[method],
+                                  summary=summary,
+                                  description=description,
+                                  parameters=params,
+                                  requestBody=request_body,
+                                  responses=operation_responses)
+            path_methods[method] = operation
+
+        return Path(summary=path_summary,
+                    description=path_description,
+                    parameters=parameters,
+                    **path_methods)
+
+
+    def _build_requests(self, requests):
+        """Build the path items of requests, and the components they use.
+
+        Nothing is kept when the built objects are invalid.
+
+        Returns:
+            list. the (type, name) of the components created, in creation
+                order.
+        """
+        bank = self.scheme_bank
+        del bank.created[:]
         paths = {}
+        try:
+            with validation_mode(self.validation):
+                for request in requests:
+                    created = len(bank.created)
+                    with bank.recording() as references:
+                        path_item = self._build_path(request)
+
+                    path = "/" + request.URI
+                    self._path_items[request] = (path, path_item)
+                    self._references[request] = references
+                    self._created[request] = bank.created[created:]
+                    paths[path] = path_item
+
+            if self.validation == DEFERRED:
+                components = {}
+                for type, name in bank.created:
+                    components.setdefault(type, {})[name] = bank[type][name]
+
+                validate_tree({"paths": paths, "components": components})
+
+            return list(bank.created)
+
+        except Exception:
+            for request in requests:
+                if request in self._path_items:
+                    self._remove_request(request)
+
+            for key in bank.created:
+                if key[1] in bank[key[0]]:
+                    bank.remove(key)
+
+            raise
+
+        finally:
+            del bank.created[:]
+
+    def _build(self):
+        """Build the requests which weren't built yet."""
+        if not self._built:
+            self._build_requests([request for request in self.requests
+                                  if request not in self._path_items])
+            self._built = True
+
+    def _remove_request(self, request):
+        del self._path_items[request]
+        del self._references[request]
+        del self._created[request]
+        self._path_fragments.pop(request, None)
+
+    def _rebuild(self, removed, index):
+        """Remove built requests, and build the requests from an index on.
+
+        The components are named in build order - a component is referenced
+        only by the request which created it and the following ones. So the
+        components created by the removed requests and by the requests from
+        the index on are removed, and these requests are built again - the
+        components get the names of a fresh build.
+
+        Args:
+            removed (list): the requests to remove, no longer registered.
+            index (number): the index of the first request to build again.
+        """
+        bank = self.scheme_bank
+        for request in list(removed) + self.requests[index:]:
+            if request in self._path_items:
+                for key in self._created[request]:
+                    if key[1] in bank[key[0]]:
+                        bank.remove(key)
+
+                self._remove_request(request)
+
+        self._build_requests(self.requests[index:])
+
+    def _reachable(self, keys):
+        """Get the components referenced by the given ones, transitively.
+
+        Args:
+            keys (iterable): (type, name) of components.
+
+        Returns:
+            set. the (type, name) of the given and the referenced components.
+        """
+        dependencies = self.scheme_bank.dependencies
+        reachable = set()
+        keys = list(keys)
+        while keys:
+            key = keys.pop()
+            if key not in reachable:
+                reachable.add(key)
+                keys.extend(dependencies.get(key, ()))
+
+        return reachable
+
+    def _changed(self):
+        self._api = None
+        self.invalidate()
+
+    def _paths_requests(self):
+        """Get the path -> request of the document, in requests order.
+
+        The last request of a path takes it, as with a dict.
+        """
+        paths = OrderedDict()
         for request in self.requests:
-            path = "/" + request.URI
-            path_description = request.__doc__
-            path_summary = path_description.split("\n", 1)[0] \
-                if path_description else None
-            methods = request.implemented_methods()
-            path_methods = {}
-            parameters = []
-            default_responses = {}
-            if request.DEFAULT_RESPONSES is not None:
-                default_responses = self._build_responses(
-                    request.DEFAULT_RESPONSES)
-
-            default_body = None
-            if request.DEFAULT_MODEL is not None:
-                default_body, parameters = self._build_parameters(
-                    request.DEFAULT_MODEL
-                )
-
-            for method in methods:
-                description = request.__doc__
-                summary = description.split("\n", 1)[
-                    0] if description else None
-
-                params = parameters
-                request_body = None
-                if request.PARAMS_MODELS[method] is not None:
-                    request_body, params = self._build_parameters(
-                        request.PARAMS_MODELS[method])
-
-                elif default_body is not None:
-                    request_body = default_body
-
-                responses = {}
-                if request.RESPONSES_MODELS[method] is not None:
-                    responses = self._build_responses(
-                        request.RESPONSES_MODELS[method])
-
-                operation_responses = default_responses.copy()
-                operation_responses.update(responses)
-
-                if operation_responses == {}:
-                    operation_responses = None
-
-                operation = Operation(tags=request.TAGS[method],
-                                      summary=summary,
-                                      description=description,
-                                      parameters=params,
-                                      requestBody=request_body,
-                                      responses=operation_responses)
-                path_methods[method] = operation
-
-            paths[path] = Path(summary=path_summary,
-                               description=path_description,
-                               parameters=parameters,
-                               **path_methods)
+            paths[self._path_items[request][0]] = request
 
         return paths
 
+    def _build_paths(self):
+        return OrderedDict((path, self._path_items[request][1])
+                           for path, request in
+                           self._paths_requests().items())
+
     def _build_file(self):
-        paths = self._build_paths()
-        components = Componenets(**self.scheme_bank)
-        return OpenAPI(openapi="3.0.1", info=self.info,
-                       paths=paths, components=components,
-                       tags=self.tags)
+        # the paths and components were validated when built
+        mode = TRUSTED if self.validation == TRUSTED else VALIDATE
+        with validation_mode(mode):
+            components = Componenets(**self.scheme_bank)
+            return OpenAPI(paths=self._build_paths(), components=components,
+                           **self._document_fields())
+
+    def _path_fragment(self, request):
+        fragment = self._path_fragments.get(request)
+        if fragment is None:
+            fragment = dumps(self._path_items[request][1].to_dict())
+            self._path_fragments[request] = fragment
+
+        return fragment
+
+    def _component_fragment(self, type, name):
+        bank = self.scheme_bank
+        fragment = bank.fragments.get((type, name))
+        if fragment is None:
+            fragment = dumps(to_primitive(bank[type][name]))
+            bank.fragments[(type, name)] = fragment
+
+        return fragment
+
+    def _document_fields(self):
+        """Get the fields of the document which aren't built."""
+        return {"openapi": OPENAPI_VERSION, "info": self.info,
+                "servers": self.servers, "tags": self.tags}
+
+    def _serialize(self):
+        """Serialize the document from the serialized path items and
+        components, only the changed ones are serialized again.
+        """
+        self._build()
+        bank = self.scheme_bank
+        return self._serialize_fragments(
+            ((path, self._path_fragment(request))
+             for path, request in self._paths_requests().items()),
+            ((type, ((name, self._component_fragment(type, name))
+                     for name in bank[type]))
+             for type in SchemaBank.TYPES))
+
+    def _serialize_tag(self, tag):
+        """Serialize the sub document of a tag's operations and the
+        components they reference.
+        """
+        self._build()
+        paths = []
+        references = set()
+        for path, request in self._paths_requests().items():
+            path_item = self._path_items[request][1]
+            operations = [name for name in OPERATIONS
+                          if path_item.kwargs.get(name) is not None]
+            tagged = [name for name in operations
+                      if tag in (path_item.kwargs[name].tags or ())]
+            if not tagged:
+                continue
+
+            document = path_item.to_dict()
+            if len(tagged) == len(operations):
+                fragment = self._path_fragment(request)
+
+            else:
+                for name in operations:
+                    if name not in tagged:
+                        del document[name]
+
+                fragment = dumps(document)
+
+            paths.append((path, fragment))
+            references.update(find_references(document))
+
+        bank = self.scheme_bank
+        reachable = self._reachable(references)
+        components = ((type, ((name, self._component_fragment(type, name))
+                              for name in bank[type]
+                              if (type, name) in reachable))
+                      for type in SchemaBank.TYPES)
+        tags = [tag_object for tag_object in self.tags or ()
+                if tag_object.name == tag]
+        return self._serialize_fragments(paths, components, tags=tags or None)
+
+    def _serialize_fragments(self, paths, components, **fields):
+        """Serialize the document from its serialized parts.
+
+        Args:
+            paths (iterable): (path, serialized path item).
+            components (iterable): (type, iterable of (name, serialized
+                component)), for every component type.
+            fields (dict): document fields to override.
+
+        Returns:
+            SerializedSpec. the serialized document.
+        """
+        document = self._document_fields()
+        document.update(fields)
+        head = []
+        tail = []
+        fields = head
+        for field in OpenAPI.fields:
+            if field.name == "servers":
+                fields = tail
+                continue
+
+            if field.name == "paths":
+                serialized = serialize_object(paths)
+
+            elif field.name == "components":
+                serialized = serialize_object(
+                    (type, serialize_object(fragments))
+                    for type, fragments in components)
+
+            elif document.get(field.name) is not None:
+                serialized = dumps(to_primitive(document[field.name]))
+
+            else:
+                continue
+
+            fields.append((field.name, serialized))
+
+        return SerializedSpec.from_fields(serialize_object(head),
+                                          serialize_object(tail),
+                                          to_primitive(self.servers))
+
+    def invalidate(self):
+        """Drop the serialized documents, after the document was changed."""
+        with self._lock:
+            self._spec = None
+            self._tag_specs.clear()
+            self._compressed.clear()
+            self._variants.clear()
 
     def configure_base_url(self, request):
-        full_path = request.build_absolute_uri()
-        pattern = r"(?P<base_url>.*?/{}).*".format(self.mount_url)
-        match = re.match(pattern, full_path)
-        self.api.servers = [Server(url=str(match.group("base_url")))]
+        """Set the servers of the document to the request's base url.
+
+        The document is shared by all of the requests - the spec view serves
+        per request variants instead.
+        """
+        base_url = self.get_base_url(request)
+        with self._lock:
+            servers = self.servers
+            if servers and len(servers) == 1 and servers[0].url == base_url:
+                return
+
+            self.servers = [Server(url=base_url)]
+            self.api.servers = self.servers
+            self.invalidate()
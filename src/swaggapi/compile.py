@@ -0,0 +1,41 @@
+"""Compile the spec of a :class:`swaggapi.build.Swagger` ahead of time.
+
+Usage:
+    python -m swaggapi.compile myapp.urls:swagger build/swagger.json
+
+The compiled spec is loaded with `Swagger(..., artifact="build/swagger.json")`.
+Django is set up from DJANGO_SETTINGS_MODULE when it's set.
+"""
+from __future__ import absolute_import, print_function
+
+import os
+import argparse
+import importlib
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m swaggapi.compile",
+        description="Compile the spec of a Swagger object into files.")
+    parser.add_argument("swagger",
+                        help="the Swagger object, as module:attribute")
+    parser.add_argument("path", help="the path of the compiled spec")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="build in a pool of that many processes")
+    parser.add_argument("--shard-by", default="module",
+                        choices=["module", "tag"],
+                        help="the shards of the parallel build")
+    args = parser.parse_args(argv)
+
+    if os.environ.get("DJANGO_SETTINGS_MODULE"):
+        import django
+        django.setup()
+
+    module_name, _, attribute = args.swagger.partition(":")
+    swagger = getattr(importlib.import_module(module_name), attribute)
+    print(swagger.compile(args.path, workers=args.workers,
+                          shard_by=args.shard_by))
+
+
+if __name__ == "__main__":
+    main()
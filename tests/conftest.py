@@ -0,0 +1,15 @@
+from __future__ import absolute_import
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "src"))
+
+import django
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure(DEBUG=False, SECRET_KEY="tests", ALLOWED_HOSTS=["*"],
+                       MIDDLEWARE=[])
+    django.setup()
@@ -0,0 +1,7 @@
+"""Requests whose components collide by name across modules and tags -
+recursive and mutually recursive models included.
+
+Every module is a shard of the parallel build (by module or by tag), the
+components of the later modules are named <name>_2, <name>_3... after the
+components of the former ones.
+"""
@@ -0,0 +1,61 @@
+from __future__ import absolute_import
+
+from six.moves import http_client
+
+from swaggapi.api.builder.common.model import AbstractAPIModel
+from swaggapi.api.builder.common.response import AbstractResponse
+from swaggapi.api.builder.common.fields import (NumberField, StringField,
+                                                ArrayField, ModelField,
+                                                DynamicType)
+from swaggapi.api.builder.server.request import DjangoRequestView
+
+
+class LeafModel(AbstractAPIModel):
+    TITLE = "Leaf"
+    PROPERTIES = [NumberField(name="id", description="leaf id 3")]
+    EXAMPLE = {}
+
+
+class TreeModel(AbstractAPIModel):
+    """A tree, recursive."""
+    TITLE = "Tree"
+    PROPERTIES = [NumberField(name="id", description="tree id 0"),
+                  ModelField(name="leaf", model=LeafModel),
+                  ArrayField(name="children",
+                             items_type=DynamicType("TreeModel", __name__))]
+    EXAMPLE = {}
+
+
+class AModel(AbstractAPIModel):
+    """A, mutually recursive with B."""
+    TITLE = "A"
+    PROPERTIES = [NumberField(name="id", description="a id 2"),
+                  ModelField(name="b", model=DynamicType("BModel", __name__))]
+    EXAMPLE = {}
+
+
+class BModel(AbstractAPIModel):
+    """B, mutually recursive with A."""
+    TITLE = "B"
+    PROPERTIES = [NumberField(name="id", description="b id 0"),
+                  ArrayField(name="as", items_type=AModel)]
+    EXAMPLE = {}
+
+
+class TreeResponse(AbstractResponse):
+    """A tree."""
+    PROPERTIES = [ModelField(name="tree", model=TreeModel, required=True),
+                  ModelField(name="a", model=AModel)]
+    EXAMPLES = {"default": {"tree": {}}}
+
+
+class GetTree(DjangoRequestView):
+    """Get a tree."""
+    URI = "trees/3"
+    PARAMS_MODELS = dict(DjangoRequestView.PARAMS_MODELS, post=BModel)
+    RESPONSES_MODELS = dict(DjangoRequestView.RESPONSES_MODELS,
+                            post={http_client.OK: TreeResponse})
+    TAGS = {"post": ["Trees"]}
+
+    def post(self, request, *args, **kwargs):
+        pass
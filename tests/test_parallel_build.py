@@ -0,0 +1,52 @@
+from __future__ import absolute_import
+
+import json
+import itertools
+
+import pytest
+
+from swaggapi.build import Swagger
+from swaggapi.api.openapi.models import Info
+
+from cyclic_app import trees_1, trees_2, trees_3
+
+INFO = Info(title="Trees", version="1")
+REQUESTS = [trees_1.GetTree, trees_2.GetTree, trees_3.GetTree]
+
+
+def make_swagger(requests=REQUESTS):
+    return Swagger(INFO, requests=requests, mount_url="api")
+
+
+@pytest.mark.parametrize("shard_by", ["module", "tag"])
+@pytest.mark.parametrize("workers", [1, 3])
+def test_cyclic_collisions_across_shards(workers, shard_by):
+    serial = make_swagger().get_spec()[0]
+    parallel = make_swagger().build(workers=workers, shard_by=shard_by)
+
+    assert parallel == serial
+    schemas = json.loads(parallel)["components"]["schemas"]
+    assert "id_2_2" not in schemas
+
+
+def shard_by_uri(request):
+    return request.URI
+
+
+@pytest.mark.parametrize("requests",
+                         [list(order)
+                          for order in itertools.permutations(REQUESTS)])
+@pytest.mark.parametrize("shard_by", ["module", "tag", shard_by_uri])
+def test_parallel_build_is_serial_build(requests, shard_by):
+    serial = make_swagger(requests).get_spec()[0]
+    parallel = make_swagger(requests).build(workers=2, shard_by=shard_by)
+
+    assert parallel == serial
+
+
+def test_parallel_build_is_served():
+    swagger = make_swagger()
+    parallel = swagger.build(workers=2)
+
+    assert swagger.get_spec()[0] == parallel
+    assert swagger.get_spec()[0] == make_swagger().get_spec()[0]
@@ -0,0 +1,95 @@
+from __future__ import absolute_import
+
+import itertools
+
+import pytest
+from six.moves import http_client
+
+from swaggapi.build import Swagger
+from swaggapi.api.openapi.models import Info
+from swaggapi.api.builder.common.model import AbstractAPIModel
+from swaggapi.api.builder.common.fields import ModelField, DynamicType
+from swaggapi.api.builder.server.request import DjangoRequestView
+
+from cyclic_app import trees_1, trees_2, trees_3
+
+INFO = Info(title="Trees", version="1")
+REQUESTS = [trees_1.GetTree, trees_2.GetTree, trees_3.GetTree]
+
+
+class BrokenModel(AbstractAPIModel):
+    """A model referencing a model which doesn't exist."""
+    PROPERTIES = [ModelField(name="missing",
+                             model=DynamicType("MissingModel", __name__))]
+    EXAMPLE = {}
+
+
+class GetBroken(DjangoRequestView):
+    """A request failing to build."""
+    URI = "broken"
+    PARAMS_MODELS = dict(DjangoRequestView.PARAMS_MODELS, post=BrokenModel)
+    RESPONSES_MODELS = dict(DjangoRequestView.RESPONSES_MODELS,
+                            post={http_client.OK: BrokenModel})
+
+    def post(self, request, *args, **kwargs):
+        pass
+
+
+def make_swagger(requests=REQUESTS):
+    return Swagger(INFO, requests=requests, mount_url="api")
+
+
+def test_failed_register_is_rolled_back():
+    swagger = make_swagger()
+    spec = swagger.get_spec()[0]
+
+    with pytest.raises(AttributeError):
+        swagger.register(GetBroken)
+
+    assert swagger.requests == REQUESTS
+    assert swagger.api is not None
+    assert swagger.get_spec()[0] == spec
+
+
+def test_failed_replace_keeps_the_old_request():
+    swagger = make_swagger()
+    spec = swagger.get_spec()[0]
+
+    with pytest.raises(AttributeError):
+        swagger.replace(trees_2.GetTree, GetBroken)
+
+    assert swagger.requests == REQUESTS
+    assert swagger.api is not None
+    assert swagger.get_spec()[0] == spec
+
+
+def assert_fresh(swagger):
+    """Assert the document is the one of a fresh build of the requests."""
+    fresh = make_swagger(swagger.requests)
+    assert swagger.get_spec()[0] == fresh.get_spec()[0]
+
+
+@pytest.mark.parametrize("request_type", REQUESTS)
+def test_unregister_is_fresh_build(request_type):
+    swagger = make_swagger()
+    swagger.get_spec()
+
+    swagger.unregister(request_type)
+    assert_fresh(swagger)
+
+    swagger.register(request_type)
+    assert_fresh(swagger)
+
+
+@pytest.mark.parametrize("old, new",
+                         list(itertools.permutations(REQUESTS, 2)))
+def test_replace_is_fresh_build(old, new):
+    requests = [request for request in REQUESTS if request is not new]
+    swagger = make_swagger(requests)
+    swagger.get_spec()
+
+    swagger.replace(old, new)
+    assert_fresh(swagger)
+
+    swagger.replace(new, old)
+    assert_fresh(swagger)